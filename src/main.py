@@ -6,9 +6,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
-from src.models.employee import Employee, QueryLog, KnowledgeBase
+from src.models.employee import Employee, QueryLog, KnowledgeBase, LeaveAdjustment
 from src.routes.user import user_bp
-from src.routes.hr_bot import hr_bot_bp
+from src.routes.hr_bot import hr_bot_bp, rule_store
+from src.routes.admin import admin_bp
+from src.routes.org import org_bp
+from src.services.db_utils import add_missing_columns
+from src.services.profiling import profiler
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -18,10 +22,26 @@ CORS(app)
 
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(hr_bot_bp, url_prefix='/api')
+app.register_blueprint(org_bp, url_prefix='/api')
+app.register_blueprint(admin_bp, url_prefix='/api')
+
+# Hot-reload keyword and template rules (HR_BOT_RULES_PATH / HR_BOT_RULES_WATCH_INTERVAL)
+rule_store.start_watching()
+
+# Opt-in request profiling (HR_BOT_PROFILE_TOKEN / HR_BOT_PROFILE_SAMPLE_RATE)
+profiler.init_app(app)
 
 # Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'HR_BOT_DATABASE_URI',
+    f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if os.environ.get('HR_BOT_SQLITE_BUSY_TIMEOUT'):
+    # Seconds SQLite waits for a lock before run_with_retry sees "database is locked" (pysqlite default: 5)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'connect_args': {'timeout': float(os.environ['HR_BOT_SQLITE_BUSY_TIMEOUT'])}
+    }
 db.init_app(app)
 
 def init_sample_data():
@@ -113,6 +133,8 @@ def init_sample_data():
 
 with app.app_context():
     db.create_all()
+    for column in add_missing_columns(db.engine, QueryLog):
+        print(f"✅ Added query_log.{column}")
     init_sample_data()
 
 @app.route('/', defaults={'path': ''}) 
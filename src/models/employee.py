@@ -52,6 +52,7 @@ class QueryLog(db.Model):
     response = db.Column(db.Text, nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     escalated = db.Column(db.Boolean, default=False)
+    follow_up = db.Column(db.Boolean, default=False)  # answered with the previous turn's intent
 
     def __repr__(self):
         return f'<QueryLog {self.id}: {self.employee_id}>'
@@ -66,7 +67,8 @@ class QueryLog(db.Model):
             'controversy_score': self.controversy_score,
             'response': self.response[:200] + '...' if len(self.response) > 200 else self.response,
             'timestamp': self.timestamp.isoformat(),
-            'escalated': self.escalated
+            'escalated': self.escalated,
+            'follow_up': bool(self.follow_up)
         }
 
 
@@ -91,4 +93,39 @@ class KnowledgeBase(db.Model):
             'keywords': self.keywords,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+
+class LeaveAdjustment(db.Model):
+    """Audit trail of leave balance changes made by the accrual engine.
+
+    (idempotency_key, employee_id) is unique, so re-running an accrual or
+    adjustment batch with the same key never applies it twice.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(100), nullable=False, index=True)
+    employee_id = db.Column(db.String(20), db.ForeignKey('employee.employee_id'), nullable=False)
+    annual_delta = db.Column(db.Integer, default=0)
+    sick_delta = db.Column(db.Integer, default=0)
+    personal_delta = db.Column(db.Integer, default=0)
+    reason = db.Column(db.String(200), default='')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('idempotency_key', 'employee_id', name='uq_leave_adjustment_key_employee'),
+    )
+
+    def __repr__(self):
+        return f'<LeaveAdjustment {self.idempotency_key}: {self.employee_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'idempotency_key': self.idempotency_key,
+            'employee_id': self.employee_id,
+            'annual_delta': self.annual_delta,
+            'sick_delta': self.sick_delta,
+            'personal_delta': self.personal_delta,
+            'reason': self.reason,
+            'created_at': self.created_at.isoformat()
+        }
@@ -0,0 +1,48 @@
+from flask import Blueprint, Response, jsonify, request
+from flask_cors import cross_origin
+from src.services.profiling import profiler
+
+admin_bp = Blueprint('admin', __name__)
+
+def _forbidden():
+    return jsonify({"error": "Profiling admin requires a valid X-Profile-Token header"}), 403
+
+@admin_bp.route('/admin/profile', methods=['GET'])
+@cross_origin()
+def get_profile():
+    if not profiler.is_authorised():
+        return _forbidden()
+    try:
+        limit = min(int(request.args.get('limit', 30)), 500)
+        sort = request.args.get('sort', 'cumulative')
+        return jsonify({
+            "requests_profiled": profiler.requests_profiled,
+            "sample_rate": profiler.sample_rate,
+            "since": profiler.since,
+            "sort": sort,
+            "functions": profiler.top_functions(limit=limit, sort=sort)
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/admin/profile/pstats', methods=['GET'])
+@cross_origin()
+def download_profile():
+    if not profiler.is_authorised():
+        return _forbidden()
+    data = profiler.dump()
+    if data is None:
+        return jsonify({"error": "No profiles captured yet"}), 404
+    return Response(
+        data,
+        mimetype='application/octet-stream',
+        headers={'Content-Disposition': 'attachment; filename=hr_bot.pstats'}
+    )
+
+@admin_bp.route('/admin/profile', methods=['DELETE'])
+@cross_origin()
+def reset_profile():
+    if not profiler.is_authorised():
+        return _forbidden()
+    profiler.reset()
+    return jsonify({"status": "reset"})
@@ -1,7 +1,19 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_cors import cross_origin
 from src.models.employee import Employee, QueryLog, KnowledgeBase, db
+from src.services.admission import chat_admission
+from src.services.classification_cache import SharedClassificationCache, classification_version
+from src.services.db_utils import commit_with_retry
+from src.services.fast_json import (
+    employee_row_to_dict, query_log_row_to_dict, select_employees, select_query_logs, stream_json_rows
+)
+from src.services.fuzzy_match import DEFAULT_EXCLUSIONS, KeywordCorrector
+from src.services.rules import RuleStore
+from src.services.sessions import conversation_sessions, is_follow_up
+from src.services.employee_index import SEARCH_FIELDS, employee_search_index
+from src.services.stats import stats
 from datetime import datetime
+import json
 
 # Try NLTK but make it completely optional
 try:
@@ -16,33 +28,41 @@ except:
 
 hr_bot_bp = Blueprint('hr_bot', __name__)
 
+def create_sentiment_analyzer():
+    # Try to use NLTK sentiment analyzer
+    if HAS_NLTK:
+        try:
+            return SentimentIntensityAnalyzer()
+        except:
+            return None
+    return None
+
+# Built once and shared by every rule set; loading VADER is the slow part
+sentiment_analyzer = create_sentiment_analyzer()
+
 class EnhancedControversialHandler:
-    def __init__(self):
-        self.controversial_keywords = [
-            "harassment", "discriminat", "racist", "sexist", "bias", "unfair",
-            "bullying", "hostile", "toxic", "retaliation", "lawsuit", "sue",
-            "pay gap", "underpaid", "violation", "illegal", "abuse", "misconduct"
-        ]
+    def __init__(self, controversial_keywords, escalation_keywords, thresholds=None,
+                 fuzzy=True, fuzzy_exclusions=DEFAULT_EXCLUSIONS, sentiment_analyzer=sentiment_analyzer):
+        self.controversial_keywords = list(controversial_keywords)
+        self.escalation_keywords = list(escalation_keywords)
         
-        self.escalation_keywords = [
-            "threat", "violence", "harm", "attack", "kill", "murder", "suicide",
-            "bomb", "weapon", "dangerous", "revenge", "assault", "hurt"
-        ]
+        thresholds = thresholds or {}
+        self.keyword_weight = thresholds.get('keyword_weight', 0.3)
+        self.escalation_threshold = thresholds.get('escalation', 0.7)
+        self.controversial_threshold = thresholds.get('controversial', 0.3)
+        # A misspelled escalation keyword sends the query to HR review instead of the emergency reply
+        self.fuzzy_escalation_weight = thresholds.get('fuzzy_escalation_weight', 0.6)
         
-        # Try to use NLTK sentiment analyzer
-        if HAS_NLTK:
-            try:
-                self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            except:
-                self.sentiment_analyzer = None
-        else:
-            self.sentiment_analyzer = None
+        # Typo-tolerant matching ("harrassment", "sucide") via a precomputed deletion index
+        self.corrector = KeywordCorrector(self.controversial_keywords + self.escalation_keywords, fuzzy_exclusions) if fuzzy else None
+        
+        self.sentiment_analyzer = sentiment_analyzer
     
     def analyze_query(self, query):
         try:
             query_lower = query.lower()
             
-            # Check for escalation
+            # Only exact escalation matches escalate; a typo correction is a guess
             for keyword in self.escalation_keywords:
                 if keyword in query_lower:
                     return "escalation_required", 1.0
@@ -63,11 +83,13 @@ class EnhancedControversialHandler:
                     sentiment_score = 0
             
             # Determine classification
-            total_score = controversy_score * 0.3 + sentiment_score
+            exact_score = controversy_score * self.keyword_weight + sentiment_score
+            total_score = exact_score + self._fuzzy_score(query_lower)
             
-            if total_score > 0.7:
-                return "escalation_required", min(total_score, 1.0)
-            elif total_score > 0.3:
+            # Keywords found only after spelling correction can raise the score but never escalate
+            if exact_score > self.escalation_threshold:
+                return "escalation_required", min(exact_score, 1.0)
+            elif total_score > self.controversial_threshold:
                 return "controversial", min(total_score, 1.0)
             else:
                 return "safe", total_score
@@ -75,84 +97,66 @@ class EnhancedControversialHandler:
         except Exception as e:
             print(f"Analysis error: {e}")
             return "safe", 0.0
+    
+    def _fuzzy_score(self, query_lower):
+        """Score for keywords that only match the spelling-corrected query ("harrassment", "sucide")"""
+        corrected = self.corrector.correct(query_lower) if self.corrector else None
+        if not corrected:
+            return 0
+        score = 0
+        for keyword in self.controversial_keywords:
+            if keyword in corrected and keyword not in query_lower:
+                score += self.keyword_weight
+        for keyword in self.escalation_keywords:
+            if keyword in corrected:
+                score += self.fuzzy_escalation_weight
+        return score
 
 class EnhancedIntentExtractor:
-    def __init__(self):
-        self.intents = {
-            "leave_inquiry": ["leave", "vacation", "time off", "pto", "holiday", "absence", "days off"],
-            "salary_inquiry": ["salary", "pay", "compensation", "wage", "income", "paycheck", "bonus"],
-            "policy_inquiry": ["policy", "rule", "regulation", "procedure", "guideline", "handbook"],
-            "benefits_inquiry": ["benefits", "insurance", "health", "dental", "401k", "retirement", "medical"],
-            "contact_inquiry": ["contact", "phone", "email", "manager", "hr", "reach", "call"],
-            "complaint_inquiry": ["complain", "report", "issue", "problem", "concern", "feedback"],
-            "training_inquiry": ["training", "course", "learning", "development", "skill", "certification"],
-            "performance_inquiry": ["performance", "review", "evaluation", "feedback", "rating", "goals"],
-            "schedule_inquiry": ["schedule", "hours", "shift", "overtime", "flexible", "remote"]
-        }
+    def __init__(self, intents, fuzzy=True, fuzzy_exclusions=DEFAULT_EXCLUSIONS):
+        self.intents = {intent: list(keywords) for intent, keywords in intents.items()}
+        
+        all_keywords = [keyword for keywords in self.intents.values() for keyword in keywords]
+        self.corrector = KeywordCorrector(all_keywords, fuzzy_exclusions) if fuzzy else None
+    
+    def _best_intent(self, text):
+        # Score each intent
+        intent_scores = {}
+        for intent, keywords in self.intents.items():
+            score = 0
+            for keyword in keywords:
+                if keyword in text:
+                    score += 1
+            intent_scores[intent] = score
+        
+        # Return the intent with highest score
+        if intent_scores:
+            best_intent = max(intent_scores, key=intent_scores.get)
+            if intent_scores[best_intent] > 0:
+                return best_intent
+        
+        return "general_info"
     
     def extract_intent(self, query):
         try:
             query_lower = query.lower()
+            intent = self._best_intent(query_lower)
             
-            # Score each intent
-            intent_scores = {}
-            for intent, keywords in self.intents.items():
-                score = 0
-                for keyword in keywords:
-                    if keyword in query_lower:
-                        score += 1
-                intent_scores[intent] = score
+            # Only fall back to typo correction when nothing matched exactly
+            if intent == "general_info" and self.corrector:
+                corrected = self.corrector.correct(query_lower)
+                if corrected:
+                    intent = self._best_intent(corrected)
             
-            # Return the intent with highest score
-            if intent_scores:
-                best_intent = max(intent_scores, key=intent_scores.get)
-                if intent_scores[best_intent] > 0:
-                    return best_intent
-            
-            return "general_info"
+            return intent
         except Exception as e:
             print(f"Intent extraction error: {e}")
             return "general_info"
 
 class EnhancedResponseGenerator:
-    def __init__(self):
-        self.response_templates = {
-            "controversial": """
-<b>Sensitive Matter Detected</b>
-
-I understand you have a concern that requires special attention. For sensitive matters like this, I recommend speaking directly with HR.
-
-<b>Contact Information:</b>
-
-• HR Email: hr@company.com
-
-• HR Phone: (555) 123-4567
-
-• Anonymous Hotline: (555) 999-TIPS
-
-• Online Portal: ethics.company.com
-
-Your query has been logged for HR review and you can expect a follow-up within 24 hours.
-            """.strip(),
-            
-            "escalation": """
-<b>URGENT - Immediate HR Attention Required</b>
-
-Your query requires immediate HR attention and has been escalated to our emergency response team.
-
-<b>Contact HR IMMEDIATELY:</b>
-
-• Emergency HR: (555) 999-8888
-
-• HR Director: (555) 123-4567
-
-• Security (if needed): ext. 911
-
-• Crisis Support: (555) 555-HELP
-
-A member of the HR team will contact you within 2 hours. If this is an emergency, please call 911.
-            """.strip()
-        }
+    def __init__(self, response_templates):
+        # str.format templates; see TEMPLATE_FIELDS in src/services/rules.py for the available fields
+        self.response_templates = dict(response_templates)
     
     def generate_response(self, employee, intent, query, knowledge_base_results=None):
         try:
@@ -160,470 +164,183 @@ A member of the HR team will contact you within 2 hours. If this is an emergency
             hour = datetime.now().hour
             greeting = "Good morning" if hour < 12 else "Good afternoon" if hour < 17 else "Good evening"
             
+            fields = {
+                "greeting": greeting,
+                "name": employee.name,
+                "manager": employee.manager,
+                "department": employee.department,
+                "annual_leave": employee.annual_leave,
+                "sick_leave": employee.sick_leave,
+                "personal_leave": employee.personal_leave,
+                "total_leave": employee.annual_leave + employee.sick_leave + employee.personal_leave,
+                "knowledge_base_results": knowledge_base_results
+            }
+            
             # Check knowledge base first
             if knowledge_base_results:
-                return f"""
-{greeting} {employee.name}! 👋
-
-
-<b>Based on our knowledge base, here's what I found:</b>
-
-{knowledge_base_results}
-
-
-Is there anything else you'd like to know?
-                """.strip()
-            
-            if intent == "leave_inquiry":
-                total = employee.annual_leave + employee.sick_leave + employee.personal_leave
-                return f"""
-{greeting} {employee.name}! 👋
-
-
-<b>Your Leave Balance:</b>
-
-• 🏖️ Annual Leave: {employee.annual_leave} days
-
-• 🏥 Sick Leave: {employee.sick_leave} days
-
-• 👤 Personal Leave: {employee.personal_leave} days
-
-• 📊 Total Available: {total} days
-
-
-<b>To Request Leave:</b>
-
-1. Contact your manager: {employee.manager}
-
-2. Submit request through HR portal: portal.company.com
-
-3. Allow 2 weeks notice for annual leave
-
-
-<b>Leave Policies:</b>
-
-• Annual leave: Use within calendar year
-
-• Sick leave: Doctor's note required for 3+ consecutive days
-
-• Personal leave: Manager approval required
-
-
-Need help with anything else?
-                """.strip()
-            
-            elif intent == "salary_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Salary & Compensation Information</b>
-
-For detailed salary information, please:
-
-• Visit the employee portal: portal.company.com
-
-• Contact HR: (555) 123-4567
-
-• Email: payroll@company.com
-
-
-<b>General Information:</b>
-
-• Pay schedule: Bi-weekly (every other Friday)
-
-• Direct deposit: Available
-
-• Pay stubs: Available online
-
-• Tax documents: W-2 available in January
-
-Salary details require secure verification for privacy protection.
-                """.strip()
-            
-            elif intent == "policy_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Company Policies & Procedures</b>
-
-<b>Key Policies:</b>
-
-• <b>Remote Work:</b> Up to 3 days/week with manager approval
-
-• <b>Leave Policy:</b> 20 annual days, submit 2 weeks advance notice
-
-• <b>Code of Conduct:</b> Zero tolerance for harassment or discrimination
-
-• <b>Performance Reviews:</b> Annual in December, mid-year check-in June
-
-• <b>Dress Code:</b> Business casual, casual Fridays
-
-• <b>Working Hours:</b> Core hours 9 AM - 3 PM, flexible start/end
-
-
-<b>For detailed policies:</b>
-
-• Employee handbook: portal.company.com/handbook
-
-• HR: (555) 123-4567
-
-• Policy updates: Check company newsletter
-                """.strip()
-            
-            elif intent == "benefits_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Your Benefits Package</b>
-
-<b>Health & Wellness:</b>
-
-• 🏥 Health Insurance: PPO/HMO options, company pays 80%
-
-• 🦷 Dental & Vision: Full coverage for preventive care
-
-• 🧘 Wellness Program: Gym membership discount, mental health support
-
-
-<b>Financial Benefits:</b>
-
-• 💰 401(k): 4% company match, immediate vesting
-
-• 💼 Life Insurance: 2x annual salary
-
-• 🏠 Disability: Short & long-term coverage
-
-
-<b>Time Off:</b>
-
-• 🏖️ Paid Time Off: 20 days annually
-
-• 🎄 Holidays: 12 paid holidays
-
-• 👶 Parental Leave: 12 weeks paid
-
-
-<b>Contact:</b>
-
-benefits@company.com | (555) 123-BENEFITS
-                """.strip()
-            
-            elif intent == "contact_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Your Key Contacts</b>
-
-<b>Direct Contacts:</b>
-
-• <b>Manager:</b> {employee.manager}
-
-• <b>Department:</b> {employee.department} team
-
-• <b>HR Representative:</b> Sarah Wilson (ext. 1234)
-
-
-<b>General Contacts:</b>
-
-• <b>HR:</b> hr@company.com | (555) 123-4567
-
-• <b>IT Support:</b> it@company.com | (555) 123-TECH
-
-• <b>Facilities:</b> facilities@company.com | (555) 123-BLDG
-
-• <b>Emergency HR:</b> (555) 999-8888
-
-• <b>Ethics Hotline:</b> (555) 999-TIPS
-
-
-<b>Office Location:</b>
-
-Building A, 2nd Floor
-
-
-<b>Reception:</b>
-
-(555) 123-0000
-                """.strip()
-            
-            elif intent == "complaint_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>How to Report Issues & Concerns</b>
-
-<b>Step 1: Direct Manager</b>
-
-• Contact: {employee.manager}
-
-• Best for: Team issues, work-related concerns
-
-
-<b>Step 2: HR Department</b>
-
-• Email: hr@company.com
-
-• Phone: (555) 123-4567
-
-• Best for: Policy violations, workplace issues
-
-
-<b>Step 3: Anonymous Reporting</b>
-
-• Ethics Hotline: (555) 999-TIPS
-
-• Online Portal: ethics.company.com
-
-• Best for: Sensitive matters, harassment
-
-
-<b>Your Rights:</b>
-
-• ✅ Confidentiality protection
-
-• ✅ No retaliation policy
-
-• ✅ Regular status updates
-
-• ✅ Fair investigation process
-
-All reports are taken seriously and investigated promptly.
-                """.strip()
-            
-            elif intent == "training_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Training & Development Opportunities</b>
-
-<b>Available Training:</b>
-
-• 💻 Technical Skills: LinkedIn Learning, Coursera
-
-• 👥 Leadership Development: Monthly workshops
-
-• 🎯 Professional Certifications: Company-sponsored
-
-• 🗣️ Communication Skills: Quarterly sessions
-
-
-<b>How to Access:</b>
-
-• Training Portal: learning.company.com
-
-• Request Form: Submit to HR
-
-• Manager Approval: Required for external training
-
-
-<b>Budget:</b>
-
-$2,000 annual training allowance per employee
-
-
-<b>Upcoming Sessions:</b>
-
-• Project Management (Next week)
-
-• Diversity & Inclusion (Monthly)
-
-• Safety Training (Quarterly)
-
-
-<b>Contact:</b>
-
-training@company.com
-                """.strip()
+                return self.response_templates["knowledge_base"].format(**fields)
             
-            elif intent == "performance_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Performance & Career Development</b>
-
-<b>Review Schedule:</b>
-
-• 📅 Annual Review: December
-
-• 🎯 Mid-Year Check-in: June
-
-• 💬 Monthly 1-on-1s: With {employee.manager}
-
-
-<b>Performance Goals:</b>
-
-• Set annually with manager
-
-• Tracked quarterly
-
-• Aligned with company objectives
-
-
-<b>Career Development:</b>
-
-• Individual Development Plan (IDP)
-
-• Mentorship Program available
-
-• Internal job postings priority
-
-
-<b>Resources:</b>
-
-• Performance Portal: performance.company.com
-
-• Career Planning Guide: Available in handbook
-
-• HR Career Counseling: Schedule with HR
-
-
-<b>Next Review:</b>
-
-Check with {employee.manager}
-                """.strip()
-            
-            elif intent == "schedule_inquiry":
-                return f"""
-{greeting} {employee.name}!
-
-
-<b>Work Schedule & Flexibility</b>
-
-<b>Standard Schedule:</b>
-
-• Core Hours: 9:00 AM - 3:00 PM
-
-• Flexible Start: 7:00 AM - 10:00 AM
-
-• Flexible End: 3:00 PM - 6:00 PM
-
-• Lunch Break: 1 hour (flexible timing)
-
-
-<b>Remote Work:</b>
-
-• Up to 3 days per week
-
-• Manager approval required
-
-• Home office setup support available
-
-
-<b>Overtime:</b>
-
-• Pre-approval required
-
-• Time-and-a-half for non-exempt employees
-
-• Comp time available for exempt employees
-
-
-<b>Time Tracking:</b>
-
-• Use company time system
-
-• Submit weekly timesheets
-
-• Manager approval required
-
-
-<b>Contact:</b>
-
-{employee.manager} for schedule changes
-                """.strip()
+            # Intents without a template of their own get the default response
+            template = self.response_templates.get(intent, self.response_templates["general_info"])
+            return template.format(**fields)
             
-            # Default response
-            return f"""
-{greeting} {employee.name}! 👋
-
-
-I'm your enhanced HR Assistant! I can help with:
-
-<b>Leave & Time Off</b> - Balances, requests, policies
-
-<b>Benefits</b> - Health, dental, 401k, life insurance  
-
-<b>Policies</b> - Company rules, procedures, handbook
-
-<b>Contacts</b> - Find the right person or department
-
-<b>Report Issues</b> - Complaints, concerns, feedback
+        except Exception as e:
+            print(f"Response generation error: {e}")
+            return f"Hi {employee.name}! I'm having trouble generating a detailed response right now, but I'm here to help with HR questions. Please contact HR at (555) 123-4567 if you need immediate assistance."
 
-<b>Training</b> - Professional development opportunities
+class CompiledRules:
+    """Handlers built from one version of the rules file; swapped as a unit on reload"""
+    
+    def __init__(self, config, version, fuzzy=True):
+        self.config = config
+        self.version = version
+        exclusions = config.get('fuzzy_exclusions', DEFAULT_EXCLUSIONS)
+        self.controversial_handler = EnhancedControversialHandler(
+            config['controversial_keywords'],
+            config['escalation_keywords'],
+            thresholds=config.get('thresholds'),
+            fuzzy=fuzzy,
+            fuzzy_exclusions=exclusions
+        )
+        self.intent_extractor = EnhancedIntentExtractor(config['intents'], fuzzy=fuzzy, fuzzy_exclusions=exclusions)
+        self.response_generator = EnhancedResponseGenerator(config['response_templates'])
+        
+        # Cached classifications are only valid for the rules (and analyzers) that produced them
+        self.cache_version = classification_version(
+            version,
+            self.controversial_handler.sentiment_analyzer is not None,
+            self.controversial_handler.corrector.settings() if self.controversial_handler.corrector else None
+        )
 
-<b>Performance</b> - Reviews, goals, career planning
+# Shared across all workers on the host; entries are keyed by the rules version
+classification_cache = SharedClassificationCache()
 
-<b>Schedule</b> - Work hours, remote work, flexibility
+# Initialize handlers from the rules file; main.py starts watching it for changes
+rule_store = RuleStore(CompiledRules)
 
+@rule_store.on_change
+def _track_rules_version(rules):
+    classification_cache.set_version(rules.cache_version)
 
-What would you like to know about? I'm here to help make your work life easier!
-            """.strip()
-            
-        except Exception as e:
-            print(f"Response generation error: {e}")
-            return f"Hi {employee.name}! I'm having trouble generating a detailed response right now, but I'm here to help with HR questions. Please contact HR at (555) 123-4567 if you need immediate assistance."
+rule_store.load()
 
-# Initialize handlers
-controversial_handler = EnhancedControversialHandler()
-intent_extractor = EnhancedIntentExtractor()
-response_generator = EnhancedResponseGenerator()
+def classify_query(query, rules=None):
+    """Return (query_type, controversy_score, intent), served from the shared cache when warm"""
+    rules = rules or rule_store.current
+    cached = classification_cache.get('classification', query, version=rules.cache_version)
+    if cached is not None:
+        return cached[0], cached[1], cached[2]
+    
+    query_type, controversy_score = rules.controversial_handler.analyze_query(query)
+    intent = rules.intent_extractor.extract_intent(query)
+    classification_cache.set('classification', query, [query_type, controversy_score, intent], version=rules.cache_version)
+    return query_type, controversy_score, intent
+
+def build_reply(employee, query, query_type, intent, rules=None):
+    """Pick the response text for a classified query; returns (response, escalated)"""
+    response_generator = (rules or rule_store.current).response_generator
+    if query_type == "escalation_required":
+        return response_generator.response_templates["escalation"], True
+    elif query_type == "controversial":
+        return response_generator.response_templates["controversial"], False
+    else:  # Safe query
+        return response_generator.generate_response(employee, intent, query), False
+
+def resolve_intent(session, query, query_type, intent):
+    """Carry the session's last intent over to a follow-up that names no topic of its own; returns (intent, follow_up)"""
+    if query_type == "safe" and intent == "general_info" and session.intent and is_follow_up(query):
+        return session.intent, True
+    return intent, False
+
+def load_session_employee(employee_id):
+    """Return (session, employee snapshot); the snapshot is reused across a conversation"""
+    session = conversation_sessions.get(employee_id)
+    employee = conversation_sessions.employee(session)
+    if employee is None:
+        conversation_sessions.discard(employee_id)
+    return session, employee
+
+def log_query(employee_id, query, query_type, intent, controversy_score, response, escalated, follow_up=False):
+    # intent is the query's own classification, not one inherited from the previous turn
+    log_entry = QueryLog(
+        employee_id=employee_id,
+        query=query,
+        query_type=query_type,
+        intent=intent,
+        controversy_score=controversy_score,
+        response=response[:500],  # Truncate for storage
+        escalated=escalated,
+        follow_up=follow_up
+    )
+    commit_with_retry(db.session, [log_entry])
+
+def parse_chat_request():
+    """Return (employee_id, query, error_response) from the request body"""
+    data = request.get_json(silent=True)
+    if not data:
+        return None, None, (jsonify({"error": "No JSON data received"}), 400)
+    
+    employee_id = data.get('employee_id')
+    query = data.get('query')
+    
+    if not employee_id or not query:
+        return None, None, (jsonify({"error": "Missing employee_id or query"}), 400)
+    return employee_id, query, None
+
+def split_response(response):
+    """Split a response into paragraph-sized chunks for streaming"""
+    paragraphs = response.split('\n\n')
+    return [p + '\n\n' for p in paragraphs[:-1]] + [paragraphs[-1]]
+
+def admission_rejected(rejection):
+    response = jsonify({
+        "error": rejection.reason,
+        "response": f"{rejection.reason}. Please try again in {rejection.retry_after} seconds.",
+        "query_type": "rejected",
+        "retry_after": rejection.retry_after
+    })
+    response.status_code = rejection.status
+    response.headers['Retry-After'] = str(rejection.retry_after)
+    return response
 
 @hr_bot_bp.route('/chat', methods=['POST'])
 @cross_origin()
 def chat():
+    employee_id, query, error = parse_chat_request()
+    if error:
+        return error
+    
+    rejection = chat_admission.admit(employee_id)
+    if rejection:
+        return admission_rejected(rejection)
+    try:
+        return answer_chat(employee_id, query)
+    finally:
+        chat_admission.release()
+
+def answer_chat(employee_id, query):
     try:
-        # Parse JSON data
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data received"}), 400
-        
-        employee_id = data.get('employee_id')
-        query = data.get('query')
-        
-        if not employee_id or not query:
-            return jsonify({"error": "Missing employee_id or query"}), 400
-        
         print(f"Received chat request: {employee_id} - {query}")
         
-        # Get employee
-        employee = Employee.query.filter_by(employee_id=employee_id).first_or_404()
+        # Get employee (cached for the rest of the conversation)
+        session, employee = load_session_employee(employee_id)
+        if employee is None:
+            return jsonify({"error": "Employee not found"}), 404
+        
+        # One rules snapshot per request, even if a reload swaps them mid-way
+        rules = rule_store.current
         
         # Analyze query
-        query_type, controversy_score = controversial_handler.analyze_query(query)
-        intent = intent_extractor.extract_intent(query)
+        query_type, controversy_score, query_intent = classify_query(query, rules)
+        intent, follow_up = resolve_intent(session, query, query_type, query_intent)
         
-        print(f"Query type: {query_type}, Intent: {intent}, Score: {controversy_score:.2f}")
+        print(f"Query type: {query_type}, Intent: {intent}, Score: {controversy_score:.2f}, Rules: {rules.version}")
         
-        # Handle based on query type
-        if query_type == "escalation_required":
-            response = response_generator.response_templates["escalation"]
-            escalated = True
-        elif query_type == "controversial":
-            response = response_generator.response_templates["controversial"]
-            escalated = False
-        else:  # Safe query
-            response = response_generator.generate_response(employee, intent, query)
-            escalated = False
+        response, escalated = build_reply(employee, query, query_type, intent, rules)
+        conversation_sessions.record_turn(session, query, query_type, intent)
         
         # Log the query
-        log_entry = QueryLog(
-            employee_id=employee_id,
-            query=query,
-            query_type=query_type,
-            intent=intent,
-            controversy_score=controversy_score,
-            response=response[:500],  # Truncate for storage
-            escalated=escalated
-        )
-        db.session.add(log_entry)
-        db.session.commit()
+        log_query(employee_id, query, query_type, query_intent, controversy_score, response, escalated, follow_up)
         
         return jsonify({
             "response": response,
@@ -631,6 +348,8 @@ def chat():
             "controversy_score": controversy_score,
             "intent": intent,
             "escalated": escalated,
+            "follow_up": follow_up,
+            "rules_version": rules.version,
             "timestamp": datetime.now().isoformat()
         })
     
@@ -646,12 +365,141 @@ def chat():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@hr_bot_bp.route('/chat/stream', methods=['POST'])
+@cross_origin()
+def chat_stream():
+    """Streaming variant of /chat as newline-delimited JSON events.
+
+    The classification event is sent as soon as the query is analyzed, the
+    response follows in paragraph chunks, then a "done" event. Escalated and
+    controversial queries are logged before the first event; safe queries are
+    logged after "done", or when the client disconnects mid-stream.
+    """
+    employee_id, query, error = parse_chat_request()
+    if error:
+        return error
+    
+    rejection = chat_admission.admit(employee_id)
+    if rejection:
+        return admission_rejected(rejection)
+    try:
+        response = start_chat_stream(employee_id, query)
+    except Exception as e:
+        chat_admission.release()
+        print(f"❌ Streaming chat endpoint error: {e}")
+        db.session.rollback()
+        return jsonify({
+            "response": "I encountered an error processing your request. Please try again or contact HR directly at (555) 123-4567.",
+            "query_type": "error",
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 500
+    # The in-flight slot is held until the response is finished or abandoned
+    response.call_on_close(chat_admission.release)
+    return response
+
+def start_chat_stream(employee_id, query):
+    print(f"Received streaming chat request: {employee_id} - {query}")
+    
+    session, employee = load_session_employee(employee_id)
+    if employee is None:
+        response = jsonify({"error": "Employee not found"})
+        response.status_code = 404
+        return response
+    
+    def event(payload):
+        return json.dumps(payload) + '\n'
+    
+    rules = rule_store.current
+    
+    def generate():
+        reply = None
+        logged = False
+        
+        def write_log():
+            query_type, query_intent, controversy_score, response, escalated, follow_up = reply
+            try:
+                log_query(employee_id, query, query_type, query_intent, controversy_score, response, escalated, follow_up)
+            except Exception as e:
+                print(f"❌ Failed to log streamed chat: {e}")
+                db.session.rollback()
+        
+        try:
+            query_type, controversy_score, query_intent = classify_query(query, rules)
+            intent, follow_up = resolve_intent(session, query, query_type, query_intent)
+            response, escalated = build_reply(employee, query, query_type, intent, rules)
+            conversation_sessions.record_turn(session, query, query_type, intent)
+            reply = (query_type, query_intent, controversy_score, response, escalated, follow_up)
+            
+            # These replies promise an HR review, so persist them before anything is sent
+            if query_type != "safe":
+                write_log()
+                logged = True
+            
+            yield event({
+                "type": "classification",
+                "query_type": query_type,
+                "controversy_score": controversy_score,
+                "intent": intent,
+                "escalated": escalated,
+                "follow_up": follow_up,
+                "rules_version": rules.version
+            })
+            for chunk in split_response(response):
+                yield event({"type": "chunk", "text": chunk})
+            yield event({"type": "done", "timestamp": datetime.now().isoformat()})
+        except Exception as e:
+            print(f"❌ Streaming chat error: {e}")
+            yield event({
+                "type": "error",
+                "response": "I encountered an error processing your request. Please try again or contact HR directly at (555) 123-4567.",
+                "error": str(e)
+            })
+        finally:
+            # Runs after "done", or when the server closes the stream on a client disconnect
+            if reply and not logged:
+                write_log()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @hr_bot_bp.route('/employees', methods=['GET'])
 @cross_origin()
 def get_employees():
     try:
-        employees = Employee.query.all()
-        return jsonify([emp.to_dict() for emp in employees])
+        return stream_json_rows(select_employees(), employee_row_to_dict)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@hr_bot_bp.route('/employees/search', methods=['GET'])
+@cross_origin()
+def search_employees():
+    try:
+        query = request.args.get('q', '')
+        field = request.args.get('field') or None
+        if field and field not in SEARCH_FIELDS:
+            return jsonify({"error": f"field must be one of {', '.join(SEARCH_FIELDS)}"}), 400
+        if not query.strip() and not field:
+            field = 'name'  # Browse alphabetically by name when nothing is typed yet
+        
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+        offset = max(0, int(request.args.get('offset', 0)))
+        
+        results, has_more = employee_search_index.search(query, field=field, limit=limit, offset=offset)
+        return jsonify({
+            "query": query,
+            "field": field,
+            "results": results,
+            "offset": offset,
+            "limit": limit,
+            "has_more": has_more,
+            "next_offset": offset + limit if has_more else None
+        })
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -670,8 +518,7 @@ def get_employee(employee_id):
 @cross_origin()
 def get_logs():
     try:
-        logs = QueryLog.query.order_by(QueryLog.timestamp.desc()).limit(100).all()
-        return jsonify([log.to_dict() for log in logs])
+        return stream_json_rows(select_query_logs(limit=100), query_log_row_to_dict)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -679,8 +526,7 @@ def get_logs():
 @cross_origin()
 def get_employee_logs(employee_id):
     try:
-        logs = QueryLog.query.filter_by(employee_id=employee_id).order_by(QueryLog.timestamp.desc()).limit(50).all()
-        return jsonify([log.to_dict() for log in logs])
+        return stream_json_rows(select_query_logs(employee_id=employee_id, limit=50), query_log_row_to_dict)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -688,9 +534,9 @@ def get_employee_logs(employee_id):
 @cross_origin()
 def get_analytics():
     try:
-        total_queries = QueryLog.query.count()
-        escalated_queries = QueryLog.query.filter_by(escalated=True).count()
-        controversial_queries = QueryLog.query.filter_by(query_type='controversial').count()
+        total_queries = db.session.query(QueryLog).count()
+        escalated_queries = db.session.query(QueryLog).filter_by(escalated=True).count()
+        controversial_queries = db.session.query(QueryLog).filter_by(query_type='controversial').count()
         
         # Intent distribution
         intent_counts = db.session.query(QueryLog.intent, db.func.count(QueryLog.intent)).group_by(QueryLog.intent).all()
@@ -705,4 +551,35 @@ def get_analytics():
     
     except Exception as e:
         print(f"Analytics error: {e}")
-        return jsonify({"error": "Failed to generate analytics", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to generate analytics", "details": str(e)}), 500
+
+@hr_bot_bp.route('/stats', methods=['GET'])
+@cross_origin()
+def get_stats():
+    try:
+        snapshot = stats.snapshot()
+        snapshot["classification_cache"] = classification_cache.stats()
+        snapshot["chat_admission"] = chat_admission.snapshot()
+        snapshot["rules_version"] = rule_store.current.version
+        snapshot["conversation_sessions"] = conversation_sessions.snapshot()
+        return jsonify(snapshot)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@hr_bot_bp.route('/rules', methods=['GET'])
+@cross_origin()
+def get_rules():
+    try:
+        rules = rule_store.current
+        return jsonify({
+            "version": rules.version,
+            "cache_version": rules.cache_version,
+            "path": rule_store.path,
+            "loaded_at": datetime.fromtimestamp(rule_store.loaded_at).isoformat(),
+            "controversial_keywords": len(rules.config['controversial_keywords']),
+            "escalation_keywords": len(rules.config['escalation_keywords']),
+            "intents": sorted(rules.config['intents']),
+            "response_templates": sorted(rules.config['response_templates'])
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,46 @@
+from flask import Blueprint, jsonify, request
+from flask_cors import cross_origin
+from src.services.org_chart import department_summaries, leave_summary_for, org_chart_index
+
+org_bp = Blueprint('org', __name__)
+
+def _flag(name):
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+@org_bp.route('/teams/<path:manager_name>', methods=['GET'])
+@cross_origin()
+def get_team(manager_name):
+    try:
+        recursive = _flag('recursive')
+        report_ids = org_chart_index.report_ids(manager_name, recursive=recursive)
+        if not report_ids:
+            return jsonify({"error": f"No employees report to {manager_name}"}), 404
+        
+        team = {"manager": manager_name, "recursive": recursive}
+        team.update(leave_summary_for(report_ids))
+        if _flag('include_members'):
+            team["members"] = org_chart_index.members(report_ids)
+        return jsonify(team)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@org_bp.route('/departments', methods=['GET'])
+@cross_origin()
+def get_departments():
+    try:
+        return jsonify(department_summaries())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@org_bp.route('/departments/<department>', methods=['GET'])
+@cross_origin()
+def get_department(department):
+    try:
+        summaries = department_summaries(department)
+        if not summaries:
+            return jsonify({"error": "Department not found"}), 404
+        name, summary = next(iter(summaries.items()))
+        summary["department"] = name
+        return jsonify(summary)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,83 @@
+"""Leave accrual and bulk adjustment job.
+
+Accrue leave for everyone (safe to run from cron - the default key is the
+current month plus the department and amounts, so a rerun never double-accrues
+and a department run never blocks a company-wide one):
+
+    python src/scripts/accrue_leave.py accrue --annual 2 --sick 1 --annual-cap 30
+    python src/scripts/accrue_leave.py accrue --annual 1 --department Sales --key sales-bonus-2026
+
+Apply adjustments from a CSV with employee_id,annual,sick,personal,reason columns:
+
+    python src/scripts/accrue_leave.py adjust corrections.csv --key corrections-2026-10-19
+
+Both commands accept --dry-run to report what would change without writing.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accrue or adjust employee leave balances in bulk")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    accrue = subparsers.add_parser('accrue', help="Apply an accrual rule to all (or one department's) employees")
+    accrue.add_argument('--key',
+                        help="Idempotency key (default: accrual-<current month>[-<department>]-a<annual>s<sick>p<personal>)")
+    accrue.add_argument('--annual', type=int, default=0)
+    accrue.add_argument('--sick', type=int, default=0)
+    accrue.add_argument('--personal', type=int, default=0)
+    accrue.add_argument('--annual-cap', type=int)
+    accrue.add_argument('--sick-cap', type=int)
+    accrue.add_argument('--personal-cap', type=int)
+    accrue.add_argument('--department')
+    accrue.add_argument('--reason', default='Monthly accrual')
+
+    adjust = subparsers.add_parser('adjust', help="Apply per-employee adjustments from a CSV file")
+    adjust.add_argument('csv_file')
+    adjust.add_argument('--key', required=True, help="Idempotency key for this batch")
+
+    for subparser in (accrue, adjust):
+        subparser.add_argument('--chunk-size', type=int, default=500)
+        subparser.add_argument('--dry-run', action='store_true')
+
+    args = parser.parse_args()
+    if args.command == 'accrue' and not (args.annual or args.sick or args.personal):
+        parser.error("accrue needs at least one of --annual, --sick or --personal")
+
+    from src.main import app
+    from src.services.leave_accrual import AccrualRule, apply_adjustments, default_accrual_key, run_accrual
+
+    with app.app_context():
+        try:
+            if args.command == 'accrue':
+                rule = AccrualRule(
+                    annual=args.annual,
+                    sick=args.sick,
+                    personal=args.personal,
+                    caps={'annual': args.annual_cap, 'sick': args.sick_cap, 'personal': args.personal_cap},
+                    department=args.department,
+                    reason=args.reason
+                )
+                key = args.key or default_accrual_key(rule)
+                summary = run_accrual(rule, key, chunk_size=args.chunk_size, dry_run=args.dry_run)
+            else:
+                with open(args.csv_file, newline='') as f:
+                    rows = list(csv.DictReader(f))
+                summary = apply_adjustments(rows, args.key, chunk_size=args.chunk_size, dry_run=args.dry_run)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Reclassify historical QueryLog rows with the current rules.
+
+Reads query_log in id order, classifies chunks across a process pool with the
+current analyze_query/extract_intent, and writes back query_type, intent and
+controversy_score for rows whose classification changed. The escalated flag
+records what actually happened at the time, so it is left alone.
+
+    python src/scripts/backfill_query_logs.py --dry-run --report diff.json
+    python src/scripts/backfill_query_logs.py --workers 8 --chunk-size 2000
+    python src/scripts/backfill_query_logs.py --resume   # continue after an interruption
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'backfill_checkpoint.json')
+
+
+def classify_chunk(rows):
+    """Worker: return (rules version, [(id, query_type, intent, controversy_score)]) for (id, query) rows"""
+    from src.routes.hr_bot import rule_store
+
+    rules = rule_store.current
+    results = []
+    for log_id, query in rows:
+        query_type, controversy_score = rules.controversial_handler.analyze_query(query)
+        intent = rules.intent_extractor.extract_intent(query)
+        results.append((log_id, query_type, intent, controversy_score))
+    return rules.version, results
+
+
+class RulesChanged(Exception):
+    def __init__(self, version):
+        super().__init__(version)
+        self.version = version
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, state):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)  # atomic, so a crash never leaves a torn checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reclassify stored QueryLog rows with the current rules")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--resume', action='store_true', help="Continue from the checkpoint of an earlier run")
+    parser.add_argument('--dry-run', action='store_true', help="Report what would change without writing")
+    parser.add_argument('--report', help="Write the diff summary as JSON to this file")
+    parser.add_argument('--samples', type=int, default=20, help="Changed rows to include in the report")
+    parser.add_argument('--limit', type=int, help="Stop after this many rows")
+    args = parser.parse_args()
+
+    # Reclassification must not fill the live classification cache with historical queries,
+    # and every chunk must be classified with the rules the run (and its checkpoint) started with
+    os.environ['HR_BOT_CLASSIFICATION_CACHE_DISABLED'] = '1'
+    os.environ['HR_BOT_RULES_WATCH_INTERVAL'] = '0'
+
+    from src.main import app
+    from src.models.employee import QueryLog, db
+    from src.routes.hr_bot import rule_store
+    from src.services.db_utils import run_with_retry
+
+    rules_version = rule_store.current.version
+    last_id = 0
+    processed = changed = 0
+    if args.resume:
+        checkpoint = read_checkpoint(args.checkpoint)
+        if checkpoint:
+            if checkpoint.get('rules_version') != rules_version:
+                print(f"❌ Checkpoint was written with rules {checkpoint.get('rules_version')}, "
+                      f"current rules are {rules_version}. Rerun without --resume to start over.")
+                return 1
+            last_id = checkpoint['last_id']
+            processed = checkpoint.get('processed', 0)
+            changed = checkpoint.get('changed', 0)
+            print(f"Resuming after id {last_id} ({processed} rows already processed)")
+
+    type_changes = Counter()
+    intent_changes = Counter()
+    samples = []
+    started = time.perf_counter()
+    run_processed = 0
+
+    with app.app_context():
+        def read_chunks(after_id):
+            remaining = args.limit
+            while remaining is None or remaining > 0:
+                size = args.chunk_size if remaining is None else min(args.chunk_size, remaining)
+                rows = db.session.execute(
+                    db.select(QueryLog.id, QueryLog.query, QueryLog.query_type, QueryLog.intent, QueryLog.controversy_score)
+                    .where(QueryLog.id > after_id)
+                    .order_by(QueryLog.id)
+                    .limit(size)
+                ).all()
+                db.session.rollback()  # don't hold a read transaction open between chunks
+                if not rows:
+                    return
+                after_id = rows[-1][0]
+                if remaining is not None:
+                    remaining -= len(rows)
+                yield rows
+
+        def apply_results(rows, results):
+            previous = {row[0]: row for row in rows}
+            updates = []
+            for log_id, query_type, intent, controversy_score in results:
+                _, query, old_type, old_intent, old_score = previous[log_id]
+                if (query_type, intent) == (old_type, old_intent) and round(controversy_score, 6) == round(old_score or 0.0, 6):
+                    continue
+                updates.append({
+                    'id': log_id,
+                    'query_type': query_type,
+                    'intent': intent,
+                    'controversy_score': controversy_score
+                })
+                type_changes[f"{old_type} -> {query_type}"] += old_type != query_type
+                intent_changes[f"{old_intent} -> {intent}"] += old_intent != intent
+                if len(samples) < args.samples:
+                    samples.append({
+                        "id": log_id,
+                        "query": query,
+                        "old": {"query_type": old_type, "intent": old_intent, "controversy_score": old_score},
+                        "new": {"query_type": query_type, "intent": intent, "controversy_score": controversy_score}
+                    })
+            if updates and not args.dry_run:
+                run_with_retry(db.session, lambda: db.session.execute(db.update(QueryLog), updates))
+            return len(updates)
+
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            pending = deque()
+
+            def finish_oldest():
+                nonlocal processed, changed, last_id, run_processed
+                rows, future = pending.popleft()
+                worker_version, results = future.result()
+                if worker_version != rules_version:
+                    raise RulesChanged(worker_version)
+                changed += apply_results(rows, results)
+                processed += len(rows)
+                run_processed += len(rows)
+                last_id = rows[-1][0]
+                if not args.dry_run:
+                    write_checkpoint(args.checkpoint, {
+                        "last_id": last_id,
+                        "rules_version": rules_version,
+                        "processed": processed,
+                        "changed": changed,
+                        "updated_at": datetime.now().isoformat()
+                    })
+                elapsed = time.perf_counter() - started
+                print(f"  processed {processed} rows (last id {last_id}), changed {changed}, "
+                      f"{run_processed / elapsed:.0f} rows/s")
+
+            # Keep a bounded number of chunks in flight; results are applied in id order
+            try:
+                for rows in read_chunks(last_id):
+                    pending.append((rows, pool.submit(classify_chunk, [(row[0], row[1]) for row in rows])))
+                    if len(pending) >= args.workers * 2:
+                        finish_oldest()
+                while pending:
+                    finish_oldest()
+            except RulesChanged as e:
+                for _, future in pending:
+                    future.cancel()
+                print(f"❌ A worker classified with rules {e.version} but this run started with {rules_version}; "
+                      f"stopped after id {last_id}. Rerun without --resume to backfill with the new rules.")
+                return 1
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "rules_version": rules_version,
+        "dry_run": args.dry_run,
+        "processed": processed,
+        "changed": changed,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(run_processed / elapsed, 1) if elapsed else 0.0,
+        "query_type_changes": {k: v for k, v in type_changes.most_common() if v},
+        "intent_changes": {k: v for k, v in intent_changes.most_common() if v},
+        "samples": samples
+    }
+    print(json.dumps({k: v for k, v in report.items() if k != 'samples'}, indent=2))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Diff report written to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
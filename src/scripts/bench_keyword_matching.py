@@ -0,0 +1,117 @@
+"""Benchmark typo-tolerant keyword matching against exact matching.
+
+Times analyze_query + extract_intent per query with the deletion-index
+corrector on and off, and shows how the misspelled sample queries classify.
+Exits with status 1 if a misspelled query classifies the same with fuzzy
+matching on (the typo was missed) or a benign near-miss ("sore throat",
+"raining") classifies differently (an ordinary word was "corrected"):
+
+    python src/scripts/bench_keyword_matching.py --iterations 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+QUERIES = [
+    "How many vacation days do I have left?",
+    "What is the policy on remote work?",
+    "Who is my manager and how do I contact them?",
+    "Tell me about dental insurance and the 401k match",
+    "I want to report harassment in my team",
+    "My coworker keeps making threats",
+    "Can I get a copy of the employee handbook please?",
+    "When is the next performance review cycle starting for the engineering department?",
+]
+
+TYPO_QUERIES = [
+    "I am facing harrassment from my supervisor",
+    "How many vacaton days do I have?",
+    "When will my salery be paid?",
+    "I have thoughts of sucide",
+    "Is there any dicsrimination policy?",
+    "I was discrimnated against by my lead",
+    "What benifits do I get?",
+]
+
+# Ordinary words one or two edits from a keyword; fuzzy matching must leave these alone
+BENIGN_NEAR_MISSES = [
+    "I have a sore throat, can I take sick leave?",
+    "Can I work in isolation from the open office?",
+    "Please attach the form to my leave request",
+    "Is the concert on Friday a company event?",
+    "What is our revenue target this quarter?",
+    "Can you remove my old address from the records?",
+    "It is raining, can I work from home?",
+    "Is there mental support for new parents?",
+]
+
+
+def time_per_query(handler, extractor, queries, iterations):
+    # Clear the per-token cache first so the cold cost is included once
+    for component in (handler, extractor):
+        if component.corrector:
+            component.corrector.lookup.cache_clear()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            handler.analyze_query(query)
+            extractor.extract_intent(query)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy keyword matching")
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    from src.routes.hr_bot import CompiledRules, rule_store
+
+    config = rule_store.current.config
+    build_start = time.perf_counter()
+    fuzzy_rules = CompiledRules(config, 'bench-fuzzy')
+    build_ms = (time.perf_counter() - build_start) * 1000
+    exact_rules = CompiledRules(config, 'bench-exact', fuzzy=False)
+    fuzzy_handler, fuzzy_extractor = fuzzy_rules.controversial_handler, fuzzy_rules.intent_extractor
+    exact_handler, exact_extractor = exact_rules.controversial_handler, exact_rules.intent_extractor
+
+    # Sentiment is identical in both configurations; leave it out to isolate matching cost
+    fuzzy_handler.sentiment_analyzer = exact_handler.sentiment_analyzer = None
+
+    queries = QUERIES + TYPO_QUERIES
+    exact_us = time_per_query(exact_handler, exact_extractor, queries, args.iterations)
+    fuzzy_us = time_per_query(fuzzy_handler, fuzzy_extractor, queries, args.iterations)
+    index_entries = len(fuzzy_handler.corrector._index) + len(fuzzy_extractor.corrector._index)
+
+    print(f"Rule set build: {build_ms:.1f}ms ({index_entries} deletion entries)")
+    print(f"Exact matching: {exact_us:.1f}µs per query")
+    print(f"Fuzzy matching: {fuzzy_us:.1f}µs per query (+{fuzzy_us - exact_us:.1f}µs)")
+
+    failures = 0
+    print("\nMisspelled queries, exact -> fuzzy (must classify differently):")
+    for query in TYPO_QUERIES:
+        exact = exact_handler.analyze_query(query) + (exact_extractor.extract_intent(query),)
+        fuzzy = fuzzy_handler.analyze_query(query) + (fuzzy_extractor.extract_intent(query),)
+        ok = (exact[0], round(exact[1], 2), exact[2]) != (fuzzy[0], round(fuzzy[1], 2), fuzzy[2])
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {query!r}: {exact[0]} ({exact[1]:.2f}) / {exact[2]} -> "
+              f"{fuzzy[0]} ({fuzzy[1]:.2f}) / {fuzzy[2]}")
+
+    print("\nBenign near-misses (must classify the same):")
+    for query in BENIGN_NEAR_MISSES:
+        exact = exact_handler.analyze_query(query) + (exact_extractor.extract_intent(query),)
+        fuzzy = fuzzy_handler.analyze_query(query) + (fuzzy_extractor.extract_intent(query),)
+        ok = exact[0] == fuzzy[0] and exact[2] == fuzzy[2]
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {query!r}: {fuzzy[0]} ({fuzzy[1]:.2f}) / {fuzzy[2]}")
+    if failures:
+        print(f"❌ {failures} queries were misclassified by fuzzy matching")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Benchmark the column-only JSON path of the list endpoints against ORM hydration.
+
+Seeds a throwaway database and, for each list query, compares the previous
+implementation (ORM objects + to_dict() + json.dumps) with the fast path
+(Core column select + direct encoding) on time and peak Python memory:
+
+    python src/scripts/bench_list_endpoints.py --employees 20000 --logs 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+
+def seed(db, Employee, QueryLog, employees, logs):
+    rnd = random.Random(42)
+    departments = ['Engineering', 'HR', 'Sales', 'Marketing', 'Finance', 'Support']
+    db.session.execute(db.insert(Employee), [
+        {
+            'employee_id': f"B{i:07d}", 'name': f"Employee {i}", 'department': rnd.choice(departments),
+            'role': 'Analyst', 'hire_date': '2021-01-01', 'manager': f"Manager {i % 200}",
+            'email': f"employee{i}@company.com", 'salary': 50000 + i % 30000, 'annual_leave': 20,
+            'sick_leave': 10, 'personal_leave': 5, 'profile_image': '', 'phone': '(555) 000-0000',
+            'emergency_contact': 'Contact - (555) 111-1111'
+        }
+        for i in range(employees)
+    ])
+    start = datetime(2026, 1, 1)
+    db.session.execute(db.insert(QueryLog), [
+        {
+            'employee_id': f"B{rnd.randrange(employees):07d}", 'query': "How many vacation days do I have left?",
+            'query_type': 'safe', 'intent': 'leave_inquiry', 'controversy_score': 0.0,
+            'response': "Good morning! Your Leave Balance: " + "x" * rnd.randrange(50, 500),
+            'timestamp': start + timedelta(seconds=i), 'escalated': False
+        }
+        for i in range(logs)
+    ])
+    db.session.commit()
+
+
+def measure(fn, repeat):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument('--employees', type=int, default=20000)
+    parser.add_argument('--logs', type=int, default=50000)
+    parser.add_argument('--log-limit', type=int, default=10000,
+                        help="Rows per log query (the endpoints use 100/50; larger shows the per-row cost)")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='hr_bot_bench_'), 'bench.db')
+    os.environ['HR_BOT_DATABASE_URI'] = f"sqlite:///{db_path}"
+
+    from src.main import app
+    from src.models.employee import Employee, QueryLog, db
+    from src.services import fast_json
+
+    with app.app_context():
+        seed(db, Employee, QueryLog, args.employees, args.logs)
+
+        def orm_employees():
+            return json.dumps([emp.to_dict() for emp in Employee.query.all()], sort_keys=True)
+
+        def orm_logs():
+            logs = db.session.query(QueryLog).order_by(QueryLog.timestamp.desc()).limit(args.log_limit).all()
+            return json.dumps([log.to_dict() for log in logs], sort_keys=True)
+
+        def fast(stmt, row_to_dict):
+            def run():
+                rows = db.session.execute(stmt).all()
+                return ''.join(fast_json._encode_array(rows, row_to_dict))
+            return run
+
+        cases = [
+            ("employees", orm_employees, fast(fast_json.select_employees(), fast_json.employee_row_to_dict)),
+            ("logs", orm_logs, fast(fast_json.select_query_logs(limit=args.log_limit), fast_json.query_log_row_to_dict)),
+        ]
+
+        print(f"{args.employees} employees, {args.logs} logs, encoder: {'orjson' if fast_json.HAS_ORJSON else 'json'}")
+        print(f"{'endpoint':<10} {'orm ms':>9} {'fast ms':>9} {'speedup':>8} {'orm MB':>8} {'fast MB':>8}")
+        for name, orm_fn, fast_fn in cases:
+            assert json.loads(orm_fn()) == json.loads(fast_fn()), f"{name}: fast path output differs"
+            db.session.expire_all()
+            orm_ms, orm_mb = measure(lambda: (orm_fn(), db.session.expire_all()), args.repeat)
+            fast_ms, fast_mb = measure(fast_fn, args.repeat)
+            print(f"{name:<10} {orm_ms:>9.1f} {fast_ms:>9.1f} {orm_ms / fast_ms:>7.1f}x {orm_mb:>8.1f} {fast_mb:>8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
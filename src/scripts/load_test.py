@@ -0,0 +1,320 @@
+"""Load generator for the HR bot API.
+
+Replays a weighted mix of /api/chat, /api/logs, /api/employees and /api/analytics
+traffic at a fixed concurrency and reports throughput, latency percentiles, error
+rates, the SQLite busy/locked retries and the time the app's write transactions
+took (including waiting for the lock) during the run.
+
+By default the app is started in a separate process (so the load generator
+doesn't compete with it for the GIL) against a throwaway SQLite database:
+
+    python src/scripts/load_test.py --concurrency 8 --duration 30
+    python src/scripts/load_test.py --sweep 1,2,4,8,16,32 --duration 15
+    python src/scripts/load_test.py --url http://localhost:5000 --mix chat=90,logs=10
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+DEFAULT_MIX = "chat=70,logs=10,employees=10,analytics=10"
+
+SAMPLE_QUERIES = [
+    "How many vacation days do I have left?",
+    "What is the policy on remote work?",
+    "How do I contact my manager?",
+    "Tell me about the dental insurance",
+    "When is my next performance review?",
+    "What training courses are available?",
+    "Can I change my shift schedule?",
+    "When is payday and how is my bonus calculated?",
+    "I want to report a problem with my team",
+    "I feel the treatment in my team is unfair and toxic",
+    "Hello, what can you help me with?",
+]
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ('chat', 'logs', 'employees', 'analytics'):
+            raise argparse.ArgumentTypeError(f"unknown endpoint in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def http_json(method, url, payload=None, timeout=30):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.status, resp.read()
+
+
+def serve(port):
+    """Run the app on port without request logging (the child side of start_local_app)"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from src.main import app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler).serve_forever()
+
+
+def start_local_app(args):
+    """Start the Flask app in a child process on a free port and return (base URL, process)"""
+    env = dict(os.environ)
+    # Measure raw capacity: admission limits would turn the excess into 429/503s.
+    # Set the HR_BOT_CHAT_* variables explicitly to load test with limits on.
+    for name in ('HR_BOT_CHAT_RATE_PER_EMPLOYEE', 'HR_BOT_CHAT_RATE_GLOBAL', 'HR_BOT_CHAT_MAX_IN_FLIGHT'):
+        env.setdefault(name, '0')
+    if args.busy_timeout is not None:
+        env['HR_BOT_SQLITE_BUSY_TIMEOUT'] = str(args.busy_timeout)
+
+    work_dir = tempfile.mkdtemp(prefix='hr_bot_load_')
+    if not args.use_app_db:
+        db_path = os.path.join(work_dir, 'load_test.db')
+        env['HR_BOT_DATABASE_URI'] = f"sqlite:///{db_path}"
+        print(f"Using throwaway database {db_path}")
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    log_path = os.path.join(work_dir, 'app.log')
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', str(port)],
+            env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            http_json('GET', f"{base_url}/api/stats", timeout=1)
+            return base_url, process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"App did not start; see {log_path}")
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, endpoint, latency, ok):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append(latency)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+def make_request(base_url, endpoint, employee_ids, unique_ratio):
+    if endpoint == 'chat':
+        query = random.choice(SAMPLE_QUERIES)
+        if random.random() < unique_ratio:
+            # Defeat the classification cache for a share of the traffic
+            query = f"{query} (ref {random.randint(0, 10 ** 9)})"
+        return http_json('POST', f"{base_url}/api/chat", {
+            "employee_id": random.choice(employee_ids),
+            "query": query
+        })
+    if endpoint == 'logs':
+        return http_json('GET', f"{base_url}/api/logs")
+    if endpoint == 'employees':
+        return http_json('GET', f"{base_url}/api/employees")
+    return http_json('GET', f"{base_url}/api/analytics")
+
+
+def fetch_counters(base_url):
+    try:
+        _, body = http_json('GET', f"{base_url}/api/stats")
+        return json.loads(body).get('counters', {})
+    except (urllib.error.URLError, ValueError):
+        return {}
+
+
+def run_level(base_url, concurrency, duration, mix, employee_ids, unique_ratio):
+    recorder = Recorder()
+    endpoints = list(mix)
+    weights = [mix[name] for name in endpoints]
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            endpoint = random.choices(endpoints, weights)[0]
+            start = time.perf_counter()
+            try:
+                status, _ = make_request(base_url, endpoint, employee_ids, unique_ratio)
+                ok = status < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            recorder.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+
+    before = fetch_counters(base_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+    after = fetch_counters(base_url)
+
+    counters = {
+        name: after.get(name, 0) - before.get(name, 0)
+        for name in ('sqlite_busy_retries', 'sqlite_busy_failures', 'sqlite_writes', 'sqlite_write_ms',
+                     'sqlite_slow_writes', 'chat_rejected_employee_rate',
+                     'chat_rejected_global_rate', 'chat_rejected_overloaded')
+    }
+    return summarize(recorder, elapsed, concurrency, counters)
+
+
+def summarize(recorder, elapsed, concurrency, counters):
+    endpoints = {}
+    all_latencies = []
+    total_errors = 0
+    for endpoint, latencies in sorted(recorder.samples.items()):
+        latencies.sort()
+        errors = recorder.errors.get(endpoint, 0)
+        total_errors += errors
+        all_latencies.extend(latencies)
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "error_rate": round(errors / len(latencies), 4)
+        }
+    all_latencies.sort()
+    total = len(all_latencies)
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 1),
+        "requests": total,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(all_latencies, 50), 1),
+        "p95_ms": round(percentile(all_latencies, 95), 1),
+        "p99_ms": round(percentile(all_latencies, 99), 1),
+        "error_rate": round(total_errors / max(total, 1), 4),
+        "sqlite_busy_retries": counters.get('sqlite_busy_retries', 0),
+        "sqlite_busy_failures": counters.get('sqlite_busy_failures', 0),
+        "sqlite_avg_write_ms": round(counters.get('sqlite_write_ms', 0) / max(counters.get('sqlite_writes', 0), 1), 1),
+        "sqlite_slow_writes": counters.get('sqlite_slow_writes', 0),
+        "chat_rejected": sum(
+            counters.get(name, 0)
+            for name in ('chat_rejected_employee_rate', 'chat_rejected_global_rate', 'chat_rejected_overloaded')
+        ),
+        "endpoints": endpoints
+    }
+
+
+def print_report(result):
+    print(f"\nConcurrency {result['concurrency']} - {result['requests']} requests in {result['duration_s']}s")
+    print(f"  Throughput: {result['rps']} req/s   Error rate: {result['error_rate'] * 100:.2f}%")
+    print(f"  Latency: p50 {result['p50_ms']}ms   p95 {result['p95_ms']}ms   p99 {result['p99_ms']}ms")
+    print(f"  SQLite busy retries: {result['sqlite_busy_retries']}   failures: {result['sqlite_busy_failures']}")
+    print(f"  SQLite writes: avg {result['sqlite_avg_write_ms']}ms   slow (>100ms): {result['sqlite_slow_writes']}")
+    print(f"  Chat requests rejected by admission control: {result['chat_rejected']}")
+    print(f"  {'endpoint':<10} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for endpoint, row in result['endpoints'].items():
+        print(f"  {endpoint:<10} {row['requests']:>7} {row['rps']:>8} {row['p50_ms']:>8} "
+              f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['error_rate'] * 100:>6.2f}%")
+
+
+def print_sweep(results):
+    print("\nConcurrency sweep")
+    print(f"  {'conc':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'busy':>6} {'write':>7} {'slow':>6}")
+    for r in results:
+        print(f"  {r['concurrency']:>5} {r['rps']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['error_rate'] * 100:>6.2f}% {r['sqlite_busy_retries']:>6} {r['sqlite_avg_write_ms']:>7} "
+              f"{r['sqlite_slow_writes']:>6}")
+
+
+def run_load(args, base_url):
+    _, body = http_json('GET', f"{base_url}/api/employees")
+    employee_ids = [emp['employee_id'] for emp in json.loads(body)]
+    if not employee_ids:
+        print("❌ No employees found - nothing to send chat requests for")
+        return 1
+
+    levels = [int(level) for level in args.sweep.split(',')] if args.sweep else [args.concurrency]
+    results = []
+    for level in levels:
+        result = run_level(base_url, level, args.duration, args.mix, employee_ids, args.unique_ratio)
+        results.append(result)
+        if not args.json:
+            print_report(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif len(results) > 1:
+        print_sweep(results)
+
+    return 0
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HR bot API")
+    parser.add_argument('--url', help="Target an already running app instead of starting one")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--sweep', help="Comma-separated concurrency levels to run one after another")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds per concurrency level")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted endpoint mix (default: {DEFAULT_MIX})")
+    parser.add_argument('--unique-ratio', type=float, default=0.2,
+                        help="Share of chat queries made unique to bypass caches")
+    parser.add_argument('--use-app-db', action='store_true',
+                        help="Run against the configured app database instead of a throwaway copy")
+    parser.add_argument('--busy-timeout', type=float,
+                        help="SQLite busy timeout in seconds for the started app (pysqlite default: 5)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--serve', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    app_process = None
+    base_url = args.url.rstrip('/') if args.url else None
+    if base_url is None:
+        base_url, app_process = start_local_app(args)
+
+    try:
+        return run_load(args, base_url)
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
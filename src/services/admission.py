@@ -0,0 +1,120 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.services.stats import stats
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def try_acquire(self, now):
+        """Take one token; returns seconds until one is available, or 0.0 on success"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class Rejection:
+    def __init__(self, status, reason, retry_after):
+        self.status = status
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """In-process admission control for the chat endpoints.
+
+    Requests must pass a per-employee token bucket, a global token bucket and a
+    cap on in-flight requests. Anything over a limit is rejected immediately
+    (429 for rate limits, 503 for overload) instead of queueing behind the
+    SQLite write lock. Setting a rate or the in-flight cap to 0 disables it.
+    """
+
+    def __init__(self, employee_rate=None, employee_burst=None, global_rate=None, global_burst=None,
+                 max_in_flight=None, max_tracked_employees=10000):
+        env = os.environ.get
+        self.employee_rate = float(employee_rate if employee_rate is not None else env('HR_BOT_CHAT_RATE_PER_EMPLOYEE', 2))
+        self.employee_burst = float(employee_burst if employee_burst is not None else env('HR_BOT_CHAT_BURST_PER_EMPLOYEE', 10))
+        self.global_rate = float(global_rate if global_rate is not None else env('HR_BOT_CHAT_RATE_GLOBAL', 200))
+        self.global_burst = float(global_burst if global_burst is not None else env('HR_BOT_CHAT_BURST_GLOBAL', 400))
+        self.max_in_flight = int(max_in_flight if max_in_flight is not None else env('HR_BOT_CHAT_MAX_IN_FLIGHT', 32))
+        self.max_tracked_employees = max_tracked_employees
+
+        self._lock = threading.Lock()
+        self._employee_buckets = OrderedDict()
+        self._global_bucket = TokenBucket(self.global_rate, self.global_burst) if self.global_rate > 0 else None
+        self.in_flight = 0
+
+    def _employee_bucket(self, employee_id):
+        bucket = self._employee_buckets.get(employee_id)
+        if bucket is None:
+            bucket = TokenBucket(self.employee_rate, self.employee_burst)
+            self._employee_buckets[employee_id] = bucket
+            if len(self._employee_buckets) > self.max_tracked_employees:
+                self._employee_buckets.popitem(last=False)
+        else:
+            self._employee_buckets.move_to_end(employee_id)
+        return bucket
+
+    def admit(self, employee_id):
+        """Reserve an in-flight slot; returns None when admitted (call release() after) or a Rejection"""
+        now = time.monotonic()
+        with self._lock:
+            employee_bucket = self._employee_bucket(employee_id) if self.employee_rate > 0 else None
+            if employee_bucket is not None:
+                wait = employee_bucket.try_acquire(now)
+                if wait:
+                    stats.increment('chat_rejected_employee_rate')
+                    return Rejection(429, "Too many requests for this employee", wait)
+
+            if self._global_bucket is not None:
+                wait = self._global_bucket.try_acquire(now)
+                if wait:
+                    if employee_bucket is not None:
+                        employee_bucket.refund()
+                    stats.increment('chat_rejected_global_rate')
+                    return Rejection(429, "The HR assistant is receiving too many requests", wait)
+
+            if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+                if employee_bucket is not None:
+                    employee_bucket.refund()
+                if self._global_bucket is not None:
+                    self._global_bucket.refund()
+                stats.increment('chat_rejected_overloaded')
+                return Rejection(503, "The HR assistant is busy", 1)
+
+            self.in_flight += 1
+        stats.increment('chat_admitted')
+        return None
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "employee_rate": self.employee_rate,
+                "employee_burst": self.employee_burst,
+                "global_rate": self.global_rate,
+                "global_burst": self.global_burst,
+                "tracked_employees": len(self._employee_buckets)
+            }
+
+
+chat_admission = AdmissionController()
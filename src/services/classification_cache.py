@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'classification_cache.db')
+
+# Hits only refresh the access time once it is this stale, so popular queries
+# don't turn every read into a write on the shared file.
+TOUCH_INTERVAL = 60.0
+# Size is checked (and the oldest entries evicted) once every N writes per process.
+EVICTION_CHECK_EVERY = 256
+# Idle connections kept per process; the threaded dev server uses a new thread per request
+POOL_SIZE = 8
+
+
+class SharedClassificationCache:
+    """Host-wide cache of query classification results.
+
+    Every worker process opens the same SQLite file (WAL mode, memory-mapped)
+    through a small per-process connection pool, so a query classified by one worker is a hit for all the others and the
+    cache stays warm across restarts. Entries are keyed by the rule-set version,
+    so changing the keyword configuration never serves stale classifications.
+    """
+
+    def __init__(self, path=None, max_entries=None, enabled=None):
+        self.path = path or os.environ.get('HR_BOT_CLASSIFICATION_CACHE', DEFAULT_CACHE_PATH)
+        self.max_entries = int(max_entries or os.environ.get('HR_BOT_CLASSIFICATION_CACHE_SIZE', 50000))
+        if enabled is None:
+            enabled = os.environ.get('HR_BOT_CLASSIFICATION_CACHE_DISABLED', '') not in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self.version = ''
+        self._lock = threading.Lock()
+        self._pool = []
+        self._pool_pid = None
+        self._schema_ready = False
+        self._writes = 0
+
+    def set_version(self, version):
+        self.version = version
+
+    def _open(self):
+        with self._lock:
+            schema_ready = self._schema_ready
+        if not schema_ready:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA mmap_size=67108864')
+        if not schema_ready:
+            # journal_mode is stored in the file, so this only has to run once per process
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS classification_cache (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    accessed REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_classification_cache_accessed ON classification_cache (accessed)')
+            with self._lock:
+                self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _connect(self):
+        """Borrow a pooled connection, opening one only when every pooled connection is in use"""
+        conn = None
+        with self._lock:
+            if self._pool_pid != os.getpid():
+                # SQLite connections must not cross a fork; a child starts with an empty pool
+                self._pool, self._pool_pid = [], os.getpid()
+            if self._pool:
+                conn = self._pool.pop()
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                if len(self._pool) < POOL_SIZE:
+                    self._pool.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def _key(self, kind, query, version):
+        raw = f"{version}\0{kind}\0{query}".encode('utf-8')
+        return hashlib.sha1(raw).hexdigest()
+
+    def get(self, kind, query, version=None):
+        if not self.enabled:
+            return None
+        try:
+            key = self._key(kind, query, version or self.version)
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT value, accessed FROM classification_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[1] > TOUCH_INTERVAL:
+                    conn.execute('UPDATE classification_cache SET accessed = ? WHERE key = ?', (now, key))
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"Classification cache read error: {e}")
+            return None
+
+    def set(self, kind, query, value, version=None):
+        """Store a result; pass the version of the rules that produced it when they may have been swapped since"""
+        if not self.enabled:
+            return
+        version = version or self.version
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO classification_cache (key, version, value, accessed) VALUES (?, ?, ?, ?)',
+                    (self._key(kind, query, version), version, json.dumps(value), time.time())
+                )
+            with self._lock:
+                self._writes += 1
+                check = self._writes % EVICTION_CHECK_EVERY == 0
+            if check:
+                self.evict()
+        except sqlite3.Error as e:
+            print(f"Classification cache write error: {e}")
+
+    def evict(self):
+        """Trim the cache back to 90% of max_entries, least recently used first."""
+        with self._connect() as conn:
+            count = conn.execute('SELECT COUNT(*) FROM classification_cache').fetchone()[0]
+            if count <= self.max_entries:
+                return 0
+            excess = count - int(self.max_entries * 0.9)
+            conn.execute(
+                'DELETE FROM classification_cache WHERE key IN '
+                '(SELECT key FROM classification_cache ORDER BY accessed LIMIT ?)',
+                (excess,)
+            )
+        return excess
+
+    def purge_stale(self):
+        """Drop entries written under any rule-set version other than the current one."""
+        try:
+            with self._connect() as conn:
+                return conn.execute('DELETE FROM classification_cache WHERE version != ?', (self.version,)).rowcount
+        except sqlite3.Error as e:
+            print(f"Classification cache purge error: {e}")
+            return 0
+
+    def stats(self):
+        try:
+            with self._connect() as conn:
+                total, current = conn.execute(
+                    'SELECT COUNT(*), SUM(version = ?) FROM classification_cache', (self.version,)
+                ).fetchone()
+        except sqlite3.Error:
+            total, current = 0, 0
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "version": self.version,
+            "entries": total,
+            "current_version_entries": current or 0,
+            "max_entries": self.max_entries
+        }
+
+
+def classification_version(*parts):
+    """Stable short hash of the configuration that determines classification results."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:12]
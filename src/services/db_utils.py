@@ -0,0 +1,69 @@
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+from src.services.stats import stats
+
+# Write transactions slower than this are counted as sqlite_slow_writes (usually waiting for the lock)
+SLOW_WRITE_SECONDS = 0.1
+
+
+def is_sqlite_busy(error):
+    message = str(getattr(error, 'orig', error)).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def run_with_retry(session, work, attempts=5, base_delay=0.02):
+    """Run work() and commit, re-running the whole unit while SQLite reports the database as locked.
+
+    A failed commit rolls the session back, so work must redo everything the
+    transaction should contain. Every retry is counted as ``sqlite_busy_retries``
+    (and a final give-up as ``sqlite_busy_failures``). pysqlite already waits
+    for the lock up to its busy timeout before reporting it, so the time each
+    write takes is recorded too (``sqlite_write_ms``, ``sqlite_slow_writes``);
+    together they let load tests see when the write lock becomes the bottleneck.
+    """
+    started = time.perf_counter()
+    for attempt in range(attempts):
+        try:
+            result = work()
+            session.commit()
+            elapsed = time.perf_counter() - started
+            stats.increment('sqlite_writes')
+            stats.increment('sqlite_write_ms', elapsed * 1000)
+            if elapsed > SLOW_WRITE_SECONDS:
+                stats.increment('sqlite_slow_writes')
+            return result
+        except OperationalError as e:
+            session.rollback()
+            if not is_sqlite_busy(e):
+                raise
+            if attempt == attempts - 1:
+                stats.increment('sqlite_busy_failures')
+                raise
+            stats.increment('sqlite_busy_retries')
+            time.sleep(base_delay * (2 ** attempt))
+
+
+def commit_with_retry(session, objects, attempts=5, base_delay=0.02):
+    """Add objects and commit, retrying while SQLite reports the database as locked"""
+    objects = list(objects)
+    run_with_retry(session, lambda: session.add_all(objects), attempts, base_delay)
+
+
+def add_missing_columns(engine, model):
+    """Add columns declared on model but missing from an existing table (create_all only creates new tables)"""
+    table = model.__table__
+    existing = {column['name'] for column in inspect(engine).get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+            if column.default is not None and column.default.is_scalar:
+                ddl += f" DEFAULT {int(column.default.arg) if isinstance(column.default.arg, bool) else repr(column.default.arg)}"
+            conn.execute(text(ddl))
+            added.append(column.name)
+    return added
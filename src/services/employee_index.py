@@ -0,0 +1,240 @@
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+
+from flask import current_app
+
+from src.models.employee import Employee, db
+from src.services.signals import employees_changed
+
+SEARCH_FIELDS = ('name', 'department', 'role', 'manager')
+
+# Past this many pending changes a full rebuild is cheaper than patching the sorted list
+MAX_INCREMENTAL_CHANGES = 1000
+LOAD_CHUNK_SIZE = 500
+
+
+def normalize(value):
+    return ' '.join((value or '').lower().split())
+
+
+def load_employee_rows(fields, employee_ids=None):
+    """Select only the given Employee columns as dicts, without ORM hydration"""
+    columns = [getattr(Employee, field) for field in fields]
+    if employee_ids is None:
+        return [dict(zip(fields, row)) for row in db.session.execute(db.select(*columns))]
+    
+    employee_ids = list(employee_ids)
+    records = []
+    for start in range(0, len(employee_ids), LOAD_CHUNK_SIZE):
+        chunk = employee_ids[start:start + LOAD_CHUNK_SIZE]
+        stmt = db.select(*columns).where(Employee.employee_id.in_(chunk))
+        records.extend(dict(zip(fields, row)) for row in db.session.execute(stmt))
+    return records
+
+
+class RefreshingEmployeeIndex:
+    """Base for in-memory indexes over employee rows kept current in the background.
+
+    Employee changes committed in this process are applied incrementally. A
+    periodic full rebuild (HR_BOT_DIRECTORY_INDEX_TTL seconds) picks up changes
+    made by other workers. That rebuild runs in a background thread while
+    lookups keep using the current index, and changes committed while it reads
+    are kept and applied afterwards.
+    Subclasses set FIELDS and implement _build, _swap and _apply.
+    """
+
+    FIELDS = ('employee_id',)
+
+    def __init__(self, ttl=None):
+        self.ttl = float(ttl if ttl is not None else os.environ.get('HR_BOT_DIRECTORY_INDEX_TTL', 300))
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._dirty = {}       # employee_id -> change sequence number
+        self._change_seq = 0
+        self._built_at = None
+        self._rebuilding = False
+
+    def _load_rows(self, employee_ids=None):
+        return load_employee_rows(self.FIELDS, employee_ids)
+
+    def _build(self, rows):
+        """Build a complete index state from rows (runs without the lock)"""
+        raise NotImplementedError
+
+    def _swap(self, state):
+        """Replace the served index with state (runs with the lock held)"""
+        raise NotImplementedError
+
+    def _apply(self, employee_ids, rows):
+        """Patch the served index for changed employees; rows omits deleted ones (runs with the lock held)"""
+        raise NotImplementedError
+
+    def rebuild(self):
+        with self._lock:
+            started_seq = self._change_seq
+        state = self._build(self._load_rows())
+        with self._lock:
+            self._swap(state)
+            # Changes committed after the rows were read still have to be applied
+            self._dirty = {employee_id: seq for employee_id, seq in self._dirty.items() if seq > started_seq}
+            self._built_at = time.monotonic()
+
+    def _rebuild_in_background(self):
+        """Start a full rebuild unless one is already running"""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        app = current_app._get_current_object()
+        name = type(self).__name__
+
+        def run():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                print(f"❌ {name} rebuild failed: {e}")
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+
+        threading.Thread(target=run, name=f"{name}-rebuild", daemon=True).start()
+
+    def invalidate(self, employee_ids):
+        with self._lock:
+            if self._built_at is not None:
+                for employee_id in employee_ids:
+                    self._change_seq += 1
+                    self._dirty[employee_id] = self._change_seq
+
+    def _refresh_dirty(self):
+        with self._lock:
+            if len(self._dirty) > MAX_INCREMENTAL_CHANGES:
+                self._rebuild_in_background()
+                return
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        rows = self._load_rows(dirty)
+        with self._lock:
+            self._apply(dirty, rows)
+
+    def ensure_current(self):
+        if self._built_at is None:
+            # Nothing to serve yet; concurrent first requests wait for a single build
+            with self._build_lock:
+                if self._built_at is None:
+                    self.rebuild()
+        elif self._rebuilding:
+            return  # pending changes are kept for the index being built
+        elif time.monotonic() - self._built_at > self.ttl:
+            self._rebuild_in_background()
+        else:
+            self._refresh_dirty()
+
+
+class EmployeeSearchIndex(RefreshingEmployeeIndex):
+    """In-memory sorted prefix index over the employee directory.
+
+    Every field value is indexed under each of its word-boundary suffixes
+    ("jane smith" -> "jane smith", "smith") in one sorted list per field, so a
+    field-filtered prefix query is a single bisect and an unfiltered one merges
+    the per-field scans. Scans stop as soon as a page is filled.
+    """
+
+    FIELDS = ('employee_id',) + SEARCH_FIELDS
+
+    def __init__(self, ttl=None):
+        super().__init__(ttl)
+        self._keys = {field: [] for field in SEARCH_FIELDS}  # field -> sorted (term, employee_id)
+        self._records = {}     # employee_id -> directory summary
+        self._entries = {}     # employee_id -> (field, term) pairs indexed for it
+
+    @staticmethod
+    def _keys_for(record):
+        keys = set()
+        for field in SEARCH_FIELDS:
+            words = normalize(record[field]).split()
+            for i in range(len(words)):
+                keys.add((field, ' '.join(words[i:])))
+        return keys
+
+    def _build(self, rows):
+        records = {}
+        entries = {}
+        keys = {field: [] for field in SEARCH_FIELDS}
+        for record in rows:
+            employee_id = record['employee_id']
+            records[employee_id] = record
+            record_keys = self._keys_for(record)
+            entries[employee_id] = record_keys
+            for field, term in record_keys:
+                keys[field].append((term, employee_id))
+        for field_keys in keys.values():
+            field_keys.sort()
+        return keys, records, entries
+
+    def _swap(self, state):
+        self._keys, self._records, self._entries = state
+
+    def _remove(self, employee_id):
+        for field, term in self._entries.pop(employee_id, ()):
+            keys = self._keys[field]
+            key = (term, employee_id)
+            position = bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+        self._records.pop(employee_id, None)
+
+    def _apply(self, employee_ids, rows):
+        rows = {record['employee_id']: record for record in rows}
+        for employee_id in employee_ids:
+            self._remove(employee_id)
+            record = rows.get(employee_id)
+            if record is None:
+                continue  # deleted
+            record_keys = self._keys_for(record)
+            for field, term in record_keys:
+                insort(self._keys[field], (term, employee_id))
+            self._entries[employee_id] = record_keys
+            self._records[employee_id] = record
+
+    @staticmethod
+    def _scan(keys, prefix):
+        """(term, employee_id) keys in one field's sorted list that start with prefix"""
+        position = bisect_left(keys, (prefix,))
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            yield keys[position]
+            position += 1
+
+    def search(self, query, field=None, limit=20, offset=0):
+        """Return (records, has_more) for employees with a field matching the prefix"""
+        self.ensure_current()
+        prefix = normalize(query)
+        wanted = offset + limit + 1
+        seen = []
+        seen_ids = set()
+        with self._lock:
+            fields = (field,) if field else SEARCH_FIELDS
+            for term, employee_id in heapq.merge(*(self._scan(self._keys[name], prefix) for name in fields)):
+                if employee_id not in seen_ids:
+                    seen_ids.add(employee_id)
+                    seen.append(self._records[employee_id])
+                    if len(seen) >= wanted:
+                        break
+        page = seen[offset:offset + limit]
+        return page, len(seen) > offset + limit
+
+    def __len__(self):
+        return len(self._records)
+
+
+employee_search_index = EmployeeSearchIndex()
+
+
+@employees_changed.connect
+def _invalidate_search_index(sender, employee_ids=(), **kwargs):
+    employee_search_index.invalidate(employee_ids)
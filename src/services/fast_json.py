@@ -0,0 +1,120 @@
+from flask import Response
+
+from src.models.employee import Employee, QueryLog, db
+
+# orjson is optional; the stdlib encoder produces the same documents, just slower
+try:
+    import orjson
+
+    def dumps(value):
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+
+    HAS_ORJSON = True
+except ImportError:
+    import json
+
+    _encoder = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    dumps = _encoder.encode
+    HAS_ORJSON = False
+
+STREAM_BATCH_SIZE = 500
+RESPONSE_PREVIEW_LENGTH = 200
+
+EMPLOYEE_COLUMNS = (
+    Employee.employee_id, Employee.name, Employee.department, Employee.role, Employee.hire_date,
+    Employee.manager, Employee.email, Employee.salary, Employee.annual_leave, Employee.sick_leave,
+    Employee.personal_leave, Employee.profile_image, Employee.phone, Employee.emergency_contact
+)
+
+
+def employee_row_to_dict(row):
+    """Same document as Employee.to_dict(), built from a column tuple"""
+    (employee_id, name, department, role, hire_date, manager, email, salary,
+     annual_leave, sick_leave, personal_leave, profile_image, phone, emergency_contact) = row
+    return {
+        'employee_id': employee_id,
+        'name': name,
+        'department': department,
+        'role': role,
+        'hire_date': hire_date,
+        'manager': manager,
+        'email': email,
+        'salary': salary,
+        'leave_balance': {
+            'annual': annual_leave,
+            'sick': sick_leave,
+            'personal': personal_leave
+        },
+        'profile_image': profile_image,
+        'phone': phone,
+        'emergency_contact': emergency_contact
+    }
+
+
+def query_log_columns():
+    # Truncate the response in SQL so the full text never leaves the database
+    response_preview = db.case(
+        (db.func.length(QueryLog.response) > RESPONSE_PREVIEW_LENGTH,
+         db.func.substr(QueryLog.response, 1, RESPONSE_PREVIEW_LENGTH) + '...'),
+        else_=QueryLog.response
+    )
+    return (
+        QueryLog.id, QueryLog.employee_id, QueryLog.query, QueryLog.query_type, QueryLog.intent,
+        QueryLog.controversy_score, response_preview, QueryLog.timestamp, QueryLog.escalated, QueryLog.follow_up
+    )
+
+
+def query_log_row_to_dict(row):
+    """Same document as QueryLog.to_dict(), built from a column tuple"""
+    log_id, employee_id, query, query_type, intent, controversy_score, response, timestamp, escalated, follow_up = row
+    return {
+        'id': log_id,
+        'employee_id': employee_id,
+        'query': query,
+        'query_type': query_type,
+        'intent': intent,
+        'controversy_score': controversy_score,
+        'response': response,
+        'timestamp': timestamp.isoformat(),
+        'escalated': escalated,
+        'follow_up': bool(follow_up)
+    }
+
+
+def select_employees():
+    return db.select(*EMPLOYEE_COLUMNS)
+
+
+def select_query_logs(employee_id=None, limit=100):
+    stmt = db.select(*query_log_columns()).order_by(QueryLog.timestamp.desc()).limit(limit)
+    if employee_id is not None:
+        stmt = stmt.where(QueryLog.employee_id == employee_id)
+    return stmt
+
+
+def _encode_array(rows, row_to_dict):
+    yield '['
+    first = True
+    batch = []
+    for row in rows:
+        batch.append(dumps(row_to_dict(row)))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield ('' if first else ',') + ','.join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield ('' if first else ',') + ','.join(batch)
+    yield ']'
+
+
+def stream_json_rows(stmt, row_to_dict):
+    """Run a column-only select and stream the rows as a JSON array.
+
+    All rows are fetched before the response is returned, so database errors
+    still surface as a normal error response and no read is left open while a
+    slow client downloads the body (on SQLite that would block every writer).
+    Only the encoding is streamed, in batches.
+    """
+    rows = db.session.execute(stmt).all()
+    db.session.rollback()  # end the read transaction now rather than at teardown
+    return Response(_encode_array(rows, row_to_dict), mimetype='application/json')
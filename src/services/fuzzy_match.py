@@ -0,0 +1,137 @@
+import re
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Tokens shorter than this are only matched exactly ("sue", "pay", "harm", "still")
+MIN_FUZZY_LENGTH = 6
+# Tokens at least this long may be corrected by two edits instead of one
+DISTANCE_2_MIN_LENGTH = 9
+# Keywords this long are often stems matched as substrings ("discriminat"); the
+# word forms they cover are indexed too so "dicsrimination" can reach them
+STEM_MIN_LENGTH = 8
+STEM_SUFFIXES = ('e', 'es', 'ed', 'ing', 'ion', 'ions', 'ory', 's')
+
+# Real words one edit away from a keyword; never "correct" these
+DEFAULT_EXCLUSIONS = frozenset([
+    "thread", "threads", "attach", "revenue", "rental", "remove", "removed", "wealth",
+    "eating", "dating", "mating", "police", "concert", "tissue", "leaning", "pursue",
+    "throat", "isolation",
+])
+
+
+def max_distance_for(length):
+    if length < MIN_FUZZY_LENGTH:
+        return 0
+    return 2 if length >= DISTANCE_2_MIN_LENGTH else 1
+
+
+def _deletes(word, distance):
+    """Every string reachable from word by deleting up to distance characters"""
+    results = set()
+    frontier = {word}
+    for _ in range(distance):
+        next_frontier = set()
+        for candidate in frontier:
+            for i in range(len(candidate)):
+                next_frontier.add(candidate[:i] + candidate[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class KeywordCorrector:
+    """SymSpell-style typo correction against a fixed keyword vocabulary.
+
+    Every vocabulary word (plus the suffixed forms of long, possibly stemmed
+    keywords) is indexed under all strings reachable by deleting up to two
+    characters. Looking up a token generates its own deletions and intersects
+    them with the index, so the cost per token depends only on the token
+    length, not on the vocabulary size. Candidates are verified with a real
+    edit distance and must keep the token's first letter, which real typos
+    almost always do ("salery") and unrelated words often don't ("mental" vs
+    "dental", "raining" vs "training").
+    """
+
+    def __init__(self, keywords, exclusions=DEFAULT_EXCLUSIONS, cache_size=8192):
+        self.vocabulary = set()
+        for keyword in keywords:
+            self.vocabulary.update(TOKEN_PATTERN.findall(keyword.lower()))
+        self.exclusions = frozenset(exclusions)
+
+        self.targets = set(self.vocabulary)
+        for word in self.vocabulary:
+            if len(word) >= STEM_MIN_LENGTH:
+                self.targets.update(word + suffix for suffix in STEM_SUFFIXES)
+
+        self._index = {}
+        for word in self.targets:
+            distance = max_distance_for(len(word) + 2)  # longer tokens may still reach it
+            if distance == 0:
+                continue
+            for variant in _deletes(word, distance) | {word}:
+                self._index.setdefault(variant, set()).add(word)
+
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, token):
+        """Closest vocabulary word within the allowed edit distance, or None"""
+        if token in self.targets or token in self.exclusions:
+            return None
+        distance = max_distance_for(len(token))
+        if distance == 0:
+            return None
+
+        candidates = set()
+        for variant in _deletes(token, distance) | {token}:
+            candidates |= self._index.get(variant, set())
+
+        best = None
+        best_distance = distance + 1
+        for word in sorted(candidates):
+            if word[0] != token[0]:
+                continue
+            d = edit_distance(token, word, distance)
+            if d < best_distance:
+                best, best_distance = word, d
+        return best
+
+    def correct(self, text):
+        """text (already lower-cased) with misspelled keywords replaced, or None if nothing changed"""
+        tokens = TOKEN_PATTERN.findall(text)
+        changed = False
+        for i, token in enumerate(tokens):
+            replacement = self.lookup(token)
+            if replacement:
+                tokens[i] = replacement
+                changed = True
+        return ' '.join(tokens) if changed else None
+
+    def settings(self):
+        return {
+            "min_fuzzy_length": MIN_FUZZY_LENGTH,
+            "distance_2_min_length": DISTANCE_2_MIN_LENGTH,
+            "stem_min_length": STEM_MIN_LENGTH,
+            "stem_suffixes": list(STEM_SUFFIXES),
+            "same_first_letter": True,
+            "exclusions": sorted(self.exclusions)
+        }
@@ -0,0 +1,222 @@
+import re
+import time
+from datetime import date, datetime
+
+from src.models.employee import Employee, LeaveAdjustment, db
+from src.services.db_utils import run_with_retry
+from src.services.signals import employees_changed
+
+LEAVE_COLUMNS = {
+    'annual': ('annual_leave', 'annual_delta'),
+    'sick': ('sick_leave', 'sick_delta'),
+    'personal': ('personal_leave', 'personal_delta'),
+}
+
+
+class AccrualRule:
+    """Days added per leave type, with optional caps and a department filter"""
+
+    def __init__(self, annual=0, sick=0, personal=0, caps=None, department=None, reason='Monthly accrual'):
+        self.amounts = {'annual': annual, 'sick': sick, 'personal': personal}
+        self.caps = caps or {}
+        self.department = department
+        self.reason = reason
+        for leave_type, amount in self.amounts.items():
+            if amount < 0:
+                raise ValueError(f"Accrual for {leave_type} leave must not be negative; use an adjustment instead")
+        if not any(self.amounts.values()):
+            raise ValueError("Accrual rule must add days to at least one leave type")
+
+    def accrued(self, leave_type):
+        """SQL expression for the new balance of one leave type"""
+        column = db.func.coalesce(getattr(Employee, LEAVE_COLUMNS[leave_type][0]), 0)
+        raised = column + self.amounts[leave_type]
+        cap = self.caps.get(leave_type)
+        if cap is None:
+            return raised
+        # Stop at the cap, but never lower a balance that is already above it
+        return db.case((raised > cap, db.case((column > cap, column), else_=cap)), else_=raised)
+
+    def delta(self, leave_type):
+        column = db.func.coalesce(getattr(Employee, LEAVE_COLUMNS[leave_type][0]), 0)
+        return self.accrued(leave_type) - column
+
+
+def default_accrual_key(rule, month=None):
+    """accrual-<month>[-<department>]-a<annual>s<sick>p<personal>, so different rules never share a key"""
+    month = month or date.today()
+    key = f"accrual-{month:%Y-%m}"
+    if rule.department:
+        key += '-' + re.sub(r'[^a-z0-9]+', '-', rule.department.lower()).strip('-')
+    amounts = rule.amounts
+    return f"{key}-a{amounts['annual']}s{amounts['sick']}p{amounts['personal']}"
+
+
+def _parse_days(row, leave_type, line):
+    value = row.get(leave_type)
+    if isinstance(value, str):
+        value = value.strip()
+    if value in (None, ''):
+        return 0
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Row {line} ({row.get('employee_id')}): {leave_type} must be a whole number of days, got {value!r}")
+
+
+def _already_applied(idempotency_key):
+    return db.select(LeaveAdjustment.employee_id).where(LeaveAdjustment.idempotency_key == idempotency_key)
+
+
+def run_accrual(rule, idempotency_key, chunk_size=500, dry_run=False):
+    """Apply an accrual rule to every matching employee in keyset-ordered chunks.
+
+    Each chunk is one transaction: an INSERT ... SELECT writes the audit rows
+    (with the deltas actually applied after caps) and a single UPDATE raises the
+    balances. Employees that already have an audit row for idempotency_key are
+    skipped, so a rerun - including one after a partial failure - only finishes
+    the remaining employees.
+    """
+    started = time.perf_counter()
+    summary = {
+        "idempotency_key": idempotency_key,
+        "dry_run": dry_run,
+        "employees_updated": 0,
+        "already_applied": db.session.execute(
+            db.select(db.func.count()).select_from(_already_applied(idempotency_key).subquery())
+        ).scalar(),
+        "chunks": 0
+    }
+
+    last_id = ''
+    while True:
+        stmt = (
+            db.select(Employee.employee_id)
+            .where(Employee.employee_id > last_id, Employee.employee_id.not_in(_already_applied(idempotency_key)))
+            .order_by(Employee.employee_id)
+            .limit(chunk_size)
+        )
+        if rule.department:
+            stmt = stmt.where(db.func.lower(Employee.department) == rule.department.lower())
+        ids = list(db.session.execute(stmt).scalars())
+        if not ids:
+            break
+        last_id = ids[-1]
+        summary["chunks"] += 1
+        summary["employees_updated"] += len(ids)
+        if dry_run:
+            continue
+
+        def apply_chunk(ids=ids):
+            now = datetime.utcnow()
+            audit = db.select(
+                db.literal(idempotency_key),
+                Employee.employee_id,
+                rule.delta('annual'),
+                rule.delta('sick'),
+                rule.delta('personal'),
+                db.literal(rule.reason),
+                db.literal(now)
+            ).where(Employee.employee_id.in_(ids))
+            db.session.execute(db.insert(LeaveAdjustment).from_select(
+                ['idempotency_key', 'employee_id', 'annual_delta', 'sick_delta', 'personal_delta', 'reason', 'created_at'],
+                audit
+            ))
+            db.session.execute(
+                db.update(Employee)
+                .where(Employee.employee_id.in_(ids))
+                .values({
+                    LEAVE_COLUMNS[leave_type][0]: rule.accrued(leave_type)
+                    for leave_type, amount in rule.amounts.items() if amount
+                })
+                .execution_options(synchronize_session=False)
+            )
+
+        run_with_retry(db.session, apply_chunk)
+        employees_changed.send(None, employee_ids=set(ids))
+
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def apply_adjustments(adjustments, idempotency_key, chunk_size=500, dry_run=False):
+    """Apply per-employee leave adjustments in bulk.
+
+    adjustments is an iterable of dicts with employee_id and any of
+    annual/sick/personal (signed day counts) and reason. Each chunk bulk-inserts
+    its audit rows and then applies them with one UPDATE that reads the deltas
+    back from the audit table.
+    """
+    started = time.perf_counter()
+    # Validate every row before the first chunk is written
+    by_employee = {}
+    for line, row in enumerate(adjustments, start=1):
+        employee_id = (row.get('employee_id') or '').strip()
+        if not employee_id:
+            raise ValueError(f"Row {line}: employee_id is missing")
+        if employee_id in by_employee:
+            raise ValueError(f"Duplicate adjustment for {employee_id} in batch {idempotency_key}")
+        by_employee[employee_id] = {
+            'annual_delta': _parse_days(row, 'annual', line),
+            'sick_delta': _parse_days(row, 'sick', line),
+            'personal_delta': _parse_days(row, 'personal', line),
+            'reason': row.get('reason') or 'Manual adjustment'
+        }
+
+    summary = {
+        "idempotency_key": idempotency_key,
+        "dry_run": dry_run,
+        "employees_updated": 0,
+        "already_applied": 0,
+        "unknown_employees": [],
+        "chunks": 0
+    }
+
+    employee_ids = sorted(by_employee)
+    for start in range(0, len(employee_ids), chunk_size):
+        chunk = employee_ids[start:start + chunk_size]
+        summary["chunks"] += 1
+        known = set(db.session.execute(
+            db.select(Employee.employee_id).where(Employee.employee_id.in_(chunk))
+        ).scalars())
+        applied = set(db.session.execute(
+            _already_applied(idempotency_key).where(LeaveAdjustment.employee_id.in_(chunk))
+        ).scalars())
+        summary["unknown_employees"].extend(employee_id for employee_id in chunk if employee_id not in known)
+        summary["already_applied"] += len(applied)
+        todo = [employee_id for employee_id in chunk if employee_id in known and employee_id not in applied]
+        if not todo:
+            continue
+        summary["employees_updated"] += len(todo)
+        if dry_run:
+            continue
+
+        def apply_chunk(todo=todo):
+            now = datetime.utcnow()
+            db.session.execute(db.insert(LeaveAdjustment), [
+                dict(by_employee[employee_id], idempotency_key=idempotency_key, employee_id=employee_id, created_at=now)
+                for employee_id in todo
+            ])
+            values = {}
+            for leave_column, delta_column in LEAVE_COLUMNS.values():
+                delta = (
+                    db.select(getattr(LeaveAdjustment, delta_column))
+                    .where(
+                        LeaveAdjustment.idempotency_key == idempotency_key,
+                        LeaveAdjustment.employee_id == Employee.employee_id
+                    )
+                    .scalar_subquery()
+                )
+                values[leave_column] = db.func.coalesce(getattr(Employee, leave_column), 0) + delta
+            db.session.execute(
+                db.update(Employee)
+                .where(Employee.employee_id.in_(todo))
+                .values(values)
+                .execution_options(synchronize_session=False)
+            )
+
+        run_with_retry(db.session, apply_chunk)
+        employees_changed.send(None, employee_ids=set(todo))
+
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return summary
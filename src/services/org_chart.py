@@ -0,0 +1,133 @@
+from src.models.employee import Employee, db
+from src.services.employee_index import LOAD_CHUNK_SIZE, RefreshingEmployeeIndex, normalize
+from src.services.signals import employees_changed
+
+LEAVE_TYPES = ('annual', 'sick', 'personal')
+
+
+class OrgChartIndex(RefreshingEmployeeIndex):
+    """Precomputed manager -> direct reports hierarchy.
+
+    Employee.manager is a free-text name, so reports are keyed by the
+    normalized manager name and managers are resolved back to employees by
+    name when walking the tree. Kept current like the directory search index
+    (see RefreshingEmployeeIndex).
+    """
+
+    FIELDS = ('employee_id', 'name', 'manager', 'department', 'role')
+
+    def __init__(self, ttl=None):
+        super().__init__(ttl)
+        self._employees = {}   # employee_id -> {employee_id, name, manager, department, role}
+        self._reports = {}     # normalized manager name -> set of employee_ids
+
+    @staticmethod
+    def _add(employees, reports, record):
+        employees[record['employee_id']] = record
+        reports.setdefault(normalize(record['manager']), set()).add(record['employee_id'])
+
+    def _remove(self, employee_id):
+        record = self._employees.pop(employee_id, None)
+        if record is None:
+            return
+        manager_key = normalize(record['manager'])
+        reports = self._reports.get(manager_key)
+        if reports is not None:
+            reports.discard(employee_id)
+            if not reports:
+                del self._reports[manager_key]
+
+    def _build(self, rows):
+        employees, reports = {}, {}
+        for record in rows:
+            self._add(employees, reports, record)
+        return employees, reports
+
+    def _swap(self, state):
+        self._employees, self._reports = state
+
+    def _apply(self, employee_ids, rows):
+        for employee_id in employee_ids:
+            self._remove(employee_id)
+        for record in rows:
+            self._add(self._employees, self._reports, record)
+
+    def report_ids(self, manager_name, recursive=False):
+        """Employee ids reporting to manager_name, directly or (recursive) through the whole subtree"""
+        self.ensure_current()
+        with self._lock:
+            found = []
+            seen = set()
+            pending = [normalize(manager_name)]
+            visited_managers = set()
+            while pending:
+                manager_key = pending.pop()
+                if manager_key in visited_managers:
+                    continue  # guard against cycles in free-text data
+                visited_managers.add(manager_key)
+                for employee_id in sorted(self._reports.get(manager_key, ())):
+                    if employee_id in seen:
+                        continue
+                    seen.add(employee_id)
+                    found.append(employee_id)
+                    if recursive:
+                        pending.append(normalize(self._employees[employee_id]['name']))
+            return found
+
+    def members(self, employee_ids):
+        with self._lock:
+            return [self._employees[employee_id] for employee_id in employee_ids if employee_id in self._employees]
+
+
+def _leave_columns():
+    return [
+        db.func.count(Employee.employee_id),
+        db.func.coalesce(db.func.sum(Employee.annual_leave), 0),
+        db.func.coalesce(db.func.sum(Employee.sick_leave), 0),
+        db.func.coalesce(db.func.sum(Employee.personal_leave), 0),
+    ]
+
+
+def _summary(headcount, totals):
+    return {
+        "headcount": headcount,
+        "leave_totals": dict(zip(LEAVE_TYPES, totals)),
+        "leave_averages": {
+            leave_type: round(total / headcount, 2) if headcount else 0.0
+            for leave_type, total in zip(LEAVE_TYPES, totals)
+        }
+    }
+
+
+def leave_summary_for(employee_ids):
+    """Headcount and leave totals/averages for a set of employees via SQL aggregates"""
+    employee_ids = list(employee_ids)
+    headcount = 0
+    totals = [0, 0, 0]
+    for start in range(0, len(employee_ids), LOAD_CHUNK_SIZE):
+        chunk = employee_ids[start:start + LOAD_CHUNK_SIZE]
+        row = db.session.execute(
+            db.select(*_leave_columns()).where(Employee.employee_id.in_(chunk))
+        ).one()
+        headcount += row[0]
+        totals = [total + value for total, value in zip(totals, row[1:])]
+    return _summary(headcount, totals)
+
+
+def department_summaries(department=None):
+    """Per-department headcount and leave aggregates from one GROUP BY query"""
+    stmt = db.select(Employee.department, *_leave_columns()).group_by(Employee.department).order_by(Employee.department)
+    if department is not None:
+        stmt = stmt.where(db.func.lower(Employee.department) == department.lower())
+    return {
+        row[0]: _summary(row[1], list(row[2:]))
+        for row in db.session.execute(stmt)
+    }
+
+
+org_chart_index = OrgChartIndex()
+
+
+@employees_changed.connect
+def _invalidate_org_chart(sender, employee_ids=(), **kwargs):
+    org_chart_index.invalidate(employee_ids)
@@ -0,0 +1,110 @@
+import cProfile
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+
+from flask import g, request
+
+from src.services.stats import stats
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+
+class RequestProfiler:
+    """Opt-in cProfile capture for individual requests, aggregated across requests.
+
+    A request is profiled when it carries the X-Profile-Token header matching
+    HR_BOT_PROFILE_TOKEN, or when it is picked by HR_BOT_PROFILE_SAMPLE_RATE
+    (0.0 - 1.0). With neither configured the request hooks return immediately.
+    Only one request is profiled at a time; concurrent candidates are skipped.
+    """
+
+    def __init__(self, token=None, sample_rate=None):
+        self.token = token if token is not None else os.environ.get('HR_BOT_PROFILE_TOKEN', '')
+        self.sample_rate = float(sample_rate if sample_rate is not None else os.environ.get('HR_BOT_PROFILE_SAMPLE_RATE', 0) or 0)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = None
+        self.requests_profiled = 0
+        self.since = time.time()
+
+    @property
+    def enabled(self):
+        return bool(self.token) or self.sample_rate > 0
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+
+    def is_authorised(self):
+        return bool(self.token) and request.headers.get(PROFILE_HEADER) == self.token
+
+    def _should_profile(self):
+        if self.is_authorised():
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start(self):
+        if not self.enabled or request.path.startswith('/api/admin/') or not self._should_profile():
+            return
+        if not self._active.acquire(blocking=False):
+            stats.increment('profiles_skipped_busy')
+            return
+        profile = cProfile.Profile()
+        g._request_profile = profile
+        profile.enable()
+
+    def _stop(self, exc=None):
+        profile = g.pop('_request_profile', None)
+        if profile is None:
+            return
+        profile.disable()
+        self._active.release()
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self.requests_profiled += 1
+        stats.increment('requests_profiled')
+
+    def reset(self):
+        with self._lock:
+            self._stats = None
+            self.requests_profiled = 0
+            self.since = time.time()
+
+    def top_functions(self, limit=30, sort='cumulative'):
+        sort_index = {'cumulative': 3, 'tottime': 2, 'calls': 1}.get(sort, 3)
+        with self._lock:
+            if self._stats is None:
+                return []
+            rows = list(self._stats.stats.items())
+        rows.sort(key=lambda item: item[1][sort_index], reverse=True)
+
+        functions = []
+        for (filename, line, name), (primitive_calls, calls, tottime, cumtime, _) in rows[:limit]:
+            functions.append({
+                "function": name,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_time": round(tottime, 6),
+                "cumulative_time": round(cumtime, 6),
+                "cumulative_per_call": round(cumtime / calls, 6) if calls else 0.0
+            })
+        return functions
+
+    def dump(self):
+        """Aggregated stats in the binary format read by pstats.Stats(filename)"""
+        with self._lock:
+            if self._stats is None:
+                return None
+            return marshal.dumps(self._stats.stats)
+
+
+profiler = RequestProfiler()
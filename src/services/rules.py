@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import string
+import threading
+import time
+
+from src.services.stats import stats
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'hr_bot_rules.json')
+
+REQUIRED_KEYS = ('controversial_keywords', 'escalation_keywords', 'intents', 'response_templates')
+REQUIRED_TEMPLATES = ('controversial', 'escalation', 'knowledge_base', 'general_info')
+TEMPLATE_FIELDS = frozenset([
+    'greeting', 'name', 'manager', 'department', 'annual_leave', 'sick_leave',
+    'personal_leave', 'total_leave', 'knowledge_base_results'
+])
+
+
+def _is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) and item for item in value)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_rules(config):
+    """Raise ValueError if a rules document is incomplete, mistyped or has unknown template fields"""
+    if not isinstance(config, dict):
+        raise ValueError("Rules must be a JSON object")
+    for key in REQUIRED_KEYS:
+        if key not in config:
+            raise ValueError(f"Rules are missing '{key}'")
+    for key in ('controversial_keywords', 'escalation_keywords'):
+        if not _is_string_list(config[key]):
+            raise ValueError(f"'{key}' must be a list of non-empty strings")
+    if 'fuzzy_exclusions' in config and not _is_string_list(config['fuzzy_exclusions']):
+        raise ValueError("'fuzzy_exclusions' must be a list of non-empty strings")
+    intents = config['intents']
+    if not isinstance(intents, dict):
+        raise ValueError("'intents' must be an object mapping intent names to keyword lists")
+    for name, keywords in intents.items():
+        if not _is_string_list(keywords):
+            raise ValueError(f"Intent '{name}' must be a list of non-empty strings")
+    thresholds = config.get('thresholds', {})
+    if not isinstance(thresholds, dict) or not all(_is_number(value) for value in thresholds.values()):
+        raise ValueError("'thresholds' must be an object of numbers")
+    templates = config['response_templates']
+    if not isinstance(templates, dict) or not all(isinstance(template, str) for template in templates.values()):
+        raise ValueError("'response_templates' must be an object of strings")
+    for name in REQUIRED_TEMPLATES:
+        if name not in templates:
+            raise ValueError(f"Rules are missing the '{name}' response template")
+    formatter = string.Formatter()
+    for name, template in templates.items():
+        try:
+            fields = {field for _, field, _, _ in formatter.parse(template) if field is not None}
+        except ValueError as e:
+            raise ValueError(f"Template '{name}' is malformed: {e}")
+        unknown = fields - TEMPLATE_FIELDS
+        if unknown:
+            raise ValueError(f"Template '{name}' uses unknown fields: {', '.join(sorted(unknown))}")
+
+
+class RuleStore:
+    """Versioned keyword and template rules loaded from a JSON file, hot-reloaded on change.
+
+    compile_rules(config, version) turns a validated document into whatever the
+    app serves requests with. Reloads compile the new rules completely before
+    swapping the single ``current`` reference, so requests never wait and never
+    see a half-built rule set; callers should read ``current`` once per request.
+    A broken file is reported and the previous rules stay active.
+    """
+
+    def __init__(self, compile_rules, path=None):
+        self.path = path or os.environ.get('HR_BOT_RULES_PATH', DEFAULT_RULES_PATH)
+        self._compile = compile_rules
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._file_state = None
+        self._watcher = None
+        self.current = None
+        self.loaded_at = None
+
+    def on_change(self, listener):
+        self._listeners.append(listener)
+        return listener
+
+    def _read(self):
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        config = json.loads(raw.decode('utf-8'))
+        validate_rules(config)
+        version = f"{config.get('version', 'unversioned')}+{hashlib.sha256(raw).hexdigest()[:8]}"
+        return config, version
+
+    def load(self):
+        """Load and compile the rules file, swapping it in if its content changed. Returns True on swap."""
+        with self._reload_lock:
+            stat = os.stat(self.path)
+            config, version = self._read()
+            self._file_state = (stat.st_mtime_ns, stat.st_size)
+            if self.current is not None and self.current.version == version:
+                return False
+            compiled = self._compile(config, version)
+            self.current = compiled
+            self.loaded_at = time.time()
+        print(f"✅ HR bot rules {version} loaded from {self.path}")
+        for listener in self._listeners:
+            listener(compiled)
+        return True
+
+    def check_for_changes(self):
+        try:
+            stat = os.stat(self.path)
+            file_state = (stat.st_mtime_ns, stat.st_size)
+            if file_state == self._file_state:
+                return False
+            # Remember the state up front so a broken file is reported once, not every poll
+            self._file_state = file_state
+            if self.load():
+                stats.increment('rules_reloads')
+                return True
+        except Exception as e:
+            # Anything a bad file can raise while compiling must not reach the watcher thread
+            stats.increment('rules_reload_failures')
+            print(f"⚠️ Failed to reload HR bot rules, keeping {self.current.version if self.current else 'none'}: {e}")
+        return False
+
+    def start_watching(self, interval=None):
+        """Poll the rules file from a daemon thread and hot-swap it when it changes"""
+        interval = float(interval if interval is not None else os.environ.get('HR_BOT_RULES_WATCH_INTERVAL', 2))
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    print(f"⚠️ Rules watcher error: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='rules-watcher', daemon=True)
+        self._watcher.start()
@@ -0,0 +1,165 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src.services.employee_index import load_employee_rows
+from src.services.signals import employees_changed
+
+SNAPSHOT_FIELDS = ('employee_id', 'name', 'department', 'role', 'manager', 'annual_leave', 'sick_leave', 'personal_leave')
+
+# Short queries that lean on the previous turn: "and how do I request it?", "what about sick days?".
+# A pronoun alone isn't enough ("thanks, that is all"); the query must also ask something.
+FOLLOW_UP_LEAD_PATTERN = re.compile(r"^(and|also|plus|what about|how about)\b")
+FOLLOW_UP_REFERENCE_PATTERN = re.compile(r"\b(it|that|this|those|them|there)\b")
+QUESTION_PATTERN = re.compile(
+    r"\?\s*$|^((so|then|ok|okay)\W+)?(what|how|when|where|who|which|why|can|could|do|does|did|is|are|will|would|should|may)\b"
+)
+FOLLOW_UP_MAX_WORDS = 10
+
+# Rough per-object overheads used for the memory cap
+SESSION_OVERHEAD_BYTES = 600
+TURN_OVERHEAD_BYTES = 200
+
+
+class EmployeeSnapshot:
+    """Read-only copy of the employee fields chat responses need"""
+    __slots__ = SNAPSHOT_FIELDS + ('loaded_at',)
+
+    def __init__(self, record):
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, record[field])
+        self.loaded_at = time.monotonic()
+
+
+class ConversationSession:
+    __slots__ = ('employee_id', 'turns', 'intent', 'employee', 'last_seen', 'size')
+
+    def __init__(self, employee_id, max_turns):
+        self.employee_id = employee_id
+        self.turns = deque(maxlen=max_turns)
+        self.intent = None
+        self.employee = None
+        self.last_seen = time.monotonic()
+        self.size = SESSION_OVERHEAD_BYTES
+
+
+def is_follow_up(query):
+    text = query.lower().strip()
+    if len(text.split()) > FOLLOW_UP_MAX_WORDS:
+        return False
+    if FOLLOW_UP_LEAD_PATTERN.search(text):
+        return True
+    return bool(FOLLOW_UP_REFERENCE_PATTERN.search(text) and QUESTION_PATTERN.search(text))
+
+
+class ConversationSessionStore:
+    """Bounded in-memory conversation state keyed by employee_id.
+
+    Holds the last few turns, the last resolved intent and an employee snapshot
+    so follow-up questions can reuse them. Sessions are evicted least recently
+    used first, after HR_BOT_SESSION_IDLE_TIMEOUT seconds of inactivity, and
+    whenever the estimated footprint exceeds HR_BOT_SESSION_MAX_BYTES. State is
+    per worker process.
+    """
+
+    def __init__(self, max_sessions=None, idle_timeout=None, max_turns=None, max_bytes=None, snapshot_ttl=None):
+        env = os.environ.get
+        self.max_sessions = int(max_sessions if max_sessions is not None else env('HR_BOT_SESSION_MAX', 10000))
+        self.idle_timeout = float(idle_timeout if idle_timeout is not None else env('HR_BOT_SESSION_IDLE_TIMEOUT', 1800))
+        self.max_turns = int(max_turns if max_turns is not None else env('HR_BOT_SESSION_MAX_TURNS', 10))
+        self.max_bytes = int(max_bytes if max_bytes is not None else env('HR_BOT_SESSION_MAX_BYTES', 16 * 1024 * 1024))
+        # Bounds staleness of snapshots changed by other workers
+        self.snapshot_ttl = float(snapshot_ttl if snapshot_ttl is not None else env('HR_BOT_SESSION_SNAPSHOT_TTL', 60))
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._bytes = 0
+
+    def _drop(self, employee_id):
+        session = self._sessions.pop(employee_id, None)
+        if session is not None:
+            self._bytes -= session.size
+
+    def _evict(self, now):
+        # Oldest sessions sit at the front, so stop at the first one still active
+        while self._sessions:
+            employee_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen > self.idle_timeout:
+                self._drop(employee_id)
+            else:
+                break
+        while self._sessions and (len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._sessions)))
+
+    def get(self, employee_id):
+        """Touch and return the employee's session, creating it if needed"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(employee_id)
+            if session is not None and now - session.last_seen > self.idle_timeout:
+                self._drop(employee_id)
+                session = None
+            if session is None:
+                session = ConversationSession(employee_id, self.max_turns)
+                self._sessions[employee_id] = session
+                self._bytes += session.size
+            else:
+                self._sessions.move_to_end(employee_id)
+            session.last_seen = now
+            self._evict(now)
+            return session
+
+    def discard(self, employee_id):
+        with self._lock:
+            self._drop(employee_id)
+
+    def employee(self, session):
+        """The session's employee snapshot, loading it with a column-only query when missing or stale"""
+        snapshot = session.employee
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at <= self.snapshot_ttl:
+            return snapshot
+        rows = load_employee_rows(SNAPSHOT_FIELDS, [session.employee_id])
+        snapshot = EmployeeSnapshot(rows[0]) if rows else None
+        session.employee = snapshot
+        return snapshot
+
+    def record_turn(self, session, query, query_type, intent):
+        delta = TURN_OVERHEAD_BYTES + len(query) + len(intent)
+        with self._lock:
+            if len(session.turns) == session.turns.maxlen:
+                dropped_query, _, dropped_intent = session.turns[0]
+                delta -= TURN_OVERHEAD_BYTES + len(dropped_query) + len(dropped_intent)
+            session.turns.append((query, query_type, intent))
+            session.size += delta
+            if self._sessions.get(session.employee_id) is session:
+                self._bytes += delta
+            if query_type == "safe" and intent != "general_info":
+                session.intent = intent
+            self._evict(time.monotonic())
+
+    def invalidate_employees(self, employee_ids):
+        with self._lock:
+            for employee_id in employee_ids:
+                session = self._sessions.get(employee_id)
+                if session is not None:
+                    session.employee = None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "estimated_bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "idle_timeout": self.idle_timeout
+            }
+
+
+conversation_sessions = ConversationSessionStore()
+
+
+@employees_changed.connect
+def _invalidate_session_snapshots(sender, employee_ids=(), **kwargs):
+    conversation_sessions.invalidate_employees(employee_ids)
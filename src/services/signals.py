@@ -0,0 +1,36 @@
+from blinker import Namespace
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from src.models.employee import Employee
+
+_signals = Namespace()
+
+# Sent after a commit that inserted, updated or deleted employees, with
+# employee_ids=<set of ids>. Bulk Core updates that bypass the ORM must send it
+# themselves so in-memory indexes and caches can refresh.
+employees_changed = _signals.signal('employees-changed')
+
+_PENDING_KEY = 'changed_employee_ids'
+
+
+def _track_change(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.employee_id)
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Employee, _event_name, _track_change)
+
+
+@event.listens_for(Session, 'after_commit')
+def _send_employee_changes(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        employees_changed.send(None, employee_ids=changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_employee_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,34 @@
+import threading
+import time
+
+
+class RuntimeStats:
+    """Process-local counters exposed through /api/stats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self.started_at = time.time()
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": counters
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+stats = RuntimeStats()